@@ -0,0 +1,63 @@
+"""
+Compara tamaño y velocidad de los codecs de core.storage sobre registros sintéticos.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_codecs.py [cantidad_de_registros]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import storage
+
+
+def generar_registros(n: int):
+    registros = []
+    for i in range(n):
+        est = f"EST{i % 5000:03d}"
+        curso = f"CUR{i % 60:03d}"
+        if i % 3:
+            registros.append({
+                "estudiante_codigo": est, "curso_codigo": curso,
+                "fecha": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                "presente": i % 7 != 0, "tipo": "asistencia",
+            })
+        else:
+            registros.append({
+                "estudiante_codigo": est, "curso_codigo": curso,
+                "nota": float(i % 21), "tipo": "nota",
+            })
+    return registros
+
+
+def medir(codec, registros, ruta):
+    storage.usar_codec(ruta, codec)
+    inicio = time.perf_counter()
+    storage.save_list(ruta, registros)
+    t_guardar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    cargados = storage.load_list(ruta)
+    t_cargar = time.perf_counter() - inicio
+
+    assert len(cargados) == len(registros)
+    return os.path.getsize(ruta), t_guardar, t_cargar
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    registros = generar_registros(n)
+    print(f"{n} registros\n")
+    print(f"{'codec':<10}{'tamaño (KB)':>14}{'guardar (s)':>14}{'cargar (s)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in (storage.CODEC_JSON, storage.CODEC_BINARIO):
+            ruta = os.path.join(tmp, f"registros.{codec.nombre}")
+            tamano, t_guardar, t_cargar = medir(codec, registros, ruta)
+            print(f"{codec.nombre:<10}{tamano / 1024:>14.0f}{t_guardar:>14.3f}{t_cargar:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
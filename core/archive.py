@@ -0,0 +1,188 @@
+from __future__ import annotations
+import gzip
+import json
+import lzma
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Registro
+from . import storage
+
+# ---------- Archivo de periodos cerrados ----------
+#
+# Al cerrar un periodo, sus registros salen de registros.json y pasan a un
+# archivo comprimido propio (data/archivo/<periodo>.json.gz o .json.xz).
+# Los resúmenes se calculan en ese momento y se guardan en indice.json, así que
+# consultarlos no requiere descomprimir nada; los registros completos de un
+# periodo solo se leen cuando se piden.
+
+ARCHIVO_DIR = os.path.join(storage.DATA_DIR, "archivo")
+INDICE_FILE = os.path.join(ARCHIVO_DIR, "indice.json")
+
+# compresión -> (extensión, comprimir, descomprimir)
+COMPRESIONES = {
+    "gzip": (".json.gz", gzip.compress, gzip.decompress),
+    "lzma": (".json.xz", lzma.compress, lzma.decompress),
+}
+
+RE_PERIODO = re.compile(r"^[A-Za-z0-9_-]{1,30}$")   # Ej: 2025-I
+
+
+@dataclass
+class PeriodoArchivado:
+    periodo: str
+    hasta: str
+    archivo: str
+    compresion: str
+    total: int
+    resumen: Dict[str, Any] = field(default_factory=dict)
+    _registros: Optional[List[Registro]] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "periodo": self.periodo, "hasta": self.hasta, "archivo": self.archivo,
+            "compresion": self.compresion, "total": self.total, "resumen": self.resumen,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PeriodoArchivado":
+        return cls(
+            periodo=data["periodo"],
+            hasta=data.get("hasta", ""),
+            archivo=data["archivo"],
+            compresion=data.get("compresion", "gzip"),
+            total=data.get("total", 0),
+            resumen=data.get("resumen", {}),
+        )
+
+    def registros(self) -> List[Registro]:
+        """Descomprime el archivo del periodo la primera vez que se pide."""
+        if self._registros is None:
+            _, _, descomprimir = COMPRESIONES[self.compresion]
+            with open(os.path.join(ARCHIVO_DIR, self.archivo), "rb") as f:
+                crudo = json.loads(descomprimir(f.read()))
+            self._registros = [
+                r for r in (storage.registro_from_dict(d) for d in crudo["registros"])
+                if r is not None
+            ]
+        return list(self._registros)
+
+
+def resumir(registros: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Agregados por curso y por estudiante: notas (cantidad, promedio, mín, máx) y asistencia."""
+    def vacio() -> Dict[str, Any]:
+        return {"notas": 0, "suma": 0.0, "minimo": None, "maximo": None,
+                "registrados": 0, "presentes": 0}
+
+    cursos: Dict[str, Dict[str, Any]] = {}
+    estudiantes: Dict[str, Dict[str, Any]] = {}
+    for d in registros:
+        for grupo, clave in ((cursos, d["curso_codigo"]), (estudiantes, d["estudiante_codigo"])):
+            acc = grupo.setdefault(clave, vacio())
+            if d["tipo"] == "nota":
+                nota = float(d["nota"])
+                acc["notas"] += 1
+                acc["suma"] += nota
+                acc["minimo"] = nota if acc["minimo"] is None else min(acc["minimo"], nota)
+                acc["maximo"] = nota if acc["maximo"] is None else max(acc["maximo"], nota)
+            else:
+                acc["registrados"] += 1
+                acc["presentes"] += bool(d["presente"])
+
+    def cerrar(acc: Dict[str, Any]) -> Dict[str, Any]:
+        suma = acc.pop("suma")
+        acc["promedio"] = round(suma / acc["notas"], 2) if acc["notas"] else None
+        acc["tasa_asistencia"] = (
+            round(acc["presentes"] / acc["registrados"], 4) if acc["registrados"] else None
+        )
+        return acc
+
+    return {
+        "cursos": {c: cerrar(a) for c, a in cursos.items()},
+        "estudiantes": {e: cerrar(a) for e, a in estudiantes.items()},
+    }
+
+
+# Caché del índice, válida mientras indice.json no cambie. Al reutilizar los
+# mismos PeriodoArchivado, un periodo ya descomprimido no se vuelve a leer.
+_indice: Optional[List[PeriodoArchivado]] = None
+_firma_indice = None
+
+def _cargar_indice() -> List[PeriodoArchivado]:
+    global _indice, _firma_indice
+    firma = storage.firma(INDICE_FILE)
+    if _indice is None or firma != _firma_indice:
+        _indice = [PeriodoArchivado.from_dict(d) for d in storage.load_list(INDICE_FILE)]
+        _firma_indice = firma
+    return _indice
+
+def listar_periodos() -> List[PeriodoArchivado]:
+    """Periodos archivados con sus resúmenes (sin leer los registros)."""
+    return list(_cargar_indice())
+
+def abrir_periodo(periodo: str) -> PeriodoArchivado:
+    for p in _cargar_indice():
+        if p.periodo == periodo:
+            return p
+    raise ValueError(f"El periodo {periodo} no está archivado.")
+
+
+def separar(registros: List[Dict[str, Any]], hasta: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Divide registros.json en (a archivar, activos). Las notas no tienen fecha:
+    todas las registradas hasta el cierre pertenecen al periodo que se cierra.
+    Las asistencias se archivan si su fecha es menor o igual a 'hasta'.
+    """
+    archivar: List[Dict[str, Any]] = []
+    activos: List[Dict[str, Any]] = []
+    for d in registros:
+        tipo = d.get("tipo")
+        if tipo == "nota" or (tipo == "asistencia" and d.get("fecha", "") <= hasta):
+            archivar.append(d)
+        else:
+            activos.append(d)
+    return archivar, activos
+
+
+def contar_a_archivar(hasta: str) -> Tuple[int, int]:
+    """(notas, asistencias) que cerrar_periodo() movería al archivo con esa fecha de corte."""
+    archivar, _ = separar(storage.load_list(storage.REGISTROS_FILE), hasta)
+    notas = sum(1 for d in archivar if d.get("tipo") == "nota")
+    return notas, len(archivar) - notas
+
+
+def cerrar_periodo(periodo: str, hasta: str, compresion: str = "gzip") -> PeriodoArchivado:
+    """Mueve los registros del periodo a su archivo comprimido y deja solo los activos."""
+    if not RE_PERIODO.fullmatch(periodo):
+        raise ValueError(f"Nombre de periodo inválido: {periodo}")
+    if compresion not in COMPRESIONES:
+        raise ValueError(f"Compresión no soportada: {compresion}")
+    indice = _cargar_indice()
+    if any(p.periodo == periodo for p in indice):
+        raise ValueError(f"El periodo {periodo} ya fue archivado.")
+
+    archivar, activos = separar(storage.load_list(storage.REGISTROS_FILE), hasta)
+    if not archivar:
+        raise ValueError(f"No hay registros para archivar hasta {hasta}.")
+
+    extension, comprimir, _ = COMPRESIONES[compresion]
+    nombre = periodo + extension
+    os.makedirs(ARCHIVO_DIR, exist_ok=True)
+    # El archivo comprimido se escribe (y sincroniza en disco) primero; el índice
+    # y registros.json se actualizan juntos en una transacción, así que nunca
+    # queda uno sin el otro ni se quitan registros que no estén ya archivados.
+    contenido = json.dumps(
+        {"periodo": periodo, "hasta": hasta, "registros": archivar}, ensure_ascii=False
+    )
+    storage._escribir_atomico(os.path.join(ARCHIVO_DIR, nombre), comprimir(contenido.encode("utf-8")))
+
+    archivado = PeriodoArchivado(
+        periodo=periodo, hasta=hasta, archivo=nombre, compresion=compresion,
+        total=len(archivar), resumen=resumir(archivar),
+    )
+    with storage.transaction():
+        storage.save_list(INDICE_FILE, [p.to_dict() for p in indice + [archivado]])
+        storage.save_list(storage.REGISTROS_FILE, activos)
+    return archivado
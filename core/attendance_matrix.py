@@ -0,0 +1,165 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Registro, RegistroAsistencia
+
+# ---------- Matriz de asistencia con bitsets ----------
+#
+# Para cada curso se mantiene la lista ordenada de días de clase (fechas en las
+# que hubo al menos un registro). Cada par (estudiante, curso) guarda dos enteros
+# usados como bitsets sobre esos días: el bit i corresponde a dias[i].
+#   - registrados: el día i tiene registro para el estudiante
+#   - presentes:   el estudiante asistió el día i
+# Las tasas y rachas se calculan con popcounts y operaciones de bits.
+
+Clave = Tuple[str, str]  # (estudiante_codigo, curso_codigo)
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+def _insertar_bit(x: int, i: int) -> int:
+    """Abre un hueco (bit 0) en la posición i desplazando los bits superiores."""
+    bajos = x & ((1 << i) - 1)
+    altos = x >> i
+    return (altos << (i + 1)) | bajos
+
+
+def _racha_maxima(x: int) -> int:
+    """Longitud de la secuencia más larga de bits 1 consecutivos."""
+    n = 0
+    while x:
+        x &= x >> 1
+        n += 1
+    return n
+
+
+@dataclass
+class AlertaAsistencia:
+    estudiante_codigo: str
+    curso_codigo: str
+    tasa: float
+    registrados: int
+
+
+class MatrizAsistencia:
+    """Índice de asistencia por (estudiante, curso) sobre los días de clase."""
+
+    def __init__(self):
+        self._dias: Dict[str, List[str]] = {}          # curso -> fechas ordenadas
+        self._presentes: Dict[Clave, int] = {}
+        self._registrados: Dict[Clave, int] = {}
+        self._por_curso: Dict[str, List[str]] = {}     # curso -> estudiantes
+
+    @classmethod
+    def desde_registros(cls, registros: Iterable[Registro]) -> "MatrizAsistencia":
+        matriz = cls()
+        asistencias = [r for r in registros if isinstance(r, RegistroAsistencia)]
+        # Fijar primero los días de cada curso evita desplazar bits al cargar.
+        dias: Dict[str, set] = {}
+        for r in asistencias:
+            dias.setdefault(r.curso_codigo, set()).add(r.fecha)
+        matriz._dias = {c: sorted(f) for c, f in dias.items()}
+        for r in asistencias:
+            matriz.registrar(r)
+        return matriz
+
+    # ---------- Actualización ----------
+
+    def _indice_dia(self, curso_codigo: str, fecha: str) -> int:
+        dias = self._dias.setdefault(curso_codigo, [])
+        i = bisect_left(dias, fecha)
+        if i < len(dias) and dias[i] == fecha:
+            return i
+        dias.insert(i, fecha)
+        if i < len(dias) - 1:
+            # Fecha intermedia: desplazar los bitsets de todo el curso.
+            for est in self._por_curso.get(curso_codigo, []):
+                clave = (est, curso_codigo)
+                self._presentes[clave] = _insertar_bit(self._presentes[clave], i)
+                self._registrados[clave] = _insertar_bit(self._registrados[clave], i)
+        return i
+
+    def registrar(self, registro: RegistroAsistencia) -> None:
+        """Aplica un registro; un segundo registro del mismo día reemplaza al anterior."""
+        curso = registro.curso_codigo
+        i = self._indice_dia(curso, registro.fecha)
+        clave = (registro.estudiante_codigo, curso)
+        if clave not in self._registrados:
+            self._registrados[clave] = 0
+            self._presentes[clave] = 0
+            self._por_curso.setdefault(curso, []).append(registro.estudiante_codigo)
+        bit = 1 << i
+        self._registrados[clave] |= bit
+        if registro.presente:
+            self._presentes[clave] |= bit
+        else:
+            self._presentes[clave] &= ~bit
+
+    # ---------- Consultas ----------
+
+    def dias_clase(self, curso_codigo: str) -> List[str]:
+        return list(self._dias.get(curso_codigo, []))
+
+    def estudiantes(self, curso_codigo: str) -> List[str]:
+        return list(self._por_curso.get(curso_codigo, []))
+
+    def _mascara(self, curso_codigo: str, desde: Optional[str], hasta: Optional[str]) -> int:
+        """Bits de los días de clase dentro de [desde, hasta] (fechas YYYY-MM-DD)."""
+        dias = self._dias.get(curso_codigo, [])
+        ini = bisect_left(dias, desde) if desde else 0
+        fin = bisect_right(dias, hasta) if hasta else len(dias)
+        if fin <= ini:
+            return 0
+        return ((1 << (fin - ini)) - 1) << ini
+
+    def conteo(self, estudiante_codigo: str, curso_codigo: str,
+               desde: Optional[str] = None, hasta: Optional[str] = None) -> Tuple[int, int]:
+        """Devuelve (presentes, registrados) en el rango de fechas indicado."""
+        clave = (estudiante_codigo, curso_codigo)
+        mascara = self._mascara(curso_codigo, desde, hasta)
+        return (
+            _popcount(self._presentes.get(clave, 0) & mascara),
+            _popcount(self._registrados.get(clave, 0) & mascara),
+        )
+
+    def tasa_asistencia(self, estudiante_codigo: str, curso_codigo: str,
+                        desde: Optional[str] = None, hasta: Optional[str] = None) -> Optional[float]:
+        """Fracción de días registrados con asistencia, o None si no hay registros."""
+        presentes, registrados = self.conteo(estudiante_codigo, curso_codigo, desde, hasta)
+        if not registrados:
+            return None
+        return presentes / registrados
+
+    def _ausencias(self, clave: Clave) -> int:
+        return self._registrados.get(clave, 0) & ~self._presentes.get(clave, 0)
+
+    def racha_ausencias(self, estudiante_codigo: str, curso_codigo: str) -> int:
+        """Mayor número de días de clase consecutivos con ausencia registrada."""
+        return _racha_maxima(self._ausencias((estudiante_codigo, curso_codigo)))
+
+    def racha_actual(self, estudiante_codigo: str, curso_codigo: str) -> int:
+        """Ausencias consecutivas hasta el último día registrado del estudiante."""
+        clave = (estudiante_codigo, curso_codigo)
+        tope = self._registrados.get(clave, 0).bit_length()
+        if not tope:
+            return 0
+        no_ausente = ~self._ausencias(clave) & ((1 << tope) - 1)
+        return tope - no_ausente.bit_length()
+
+    def alertas(self, umbral: float, curso_codigo: Optional[str] = None,
+                desde: Optional[str] = None, hasta: Optional[str] = None) -> List[AlertaAsistencia]:
+        """Estudiantes cuya tasa de asistencia está por debajo del umbral (0–1)."""
+        cursos = [curso_codigo] if curso_codigo else list(self._por_curso)
+        alertas: List[AlertaAsistencia] = []
+        for curso in cursos:
+            for est in self._por_curso.get(curso, []):
+                presentes, registrados = self.conteo(est, curso, desde, hasta)
+                if registrados and presentes / registrados < umbral:
+                    alertas.append(
+                        AlertaAsistencia(est, curso, presentes / registrados, registrados)
+                    )
+        return alertas
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import storage
+
+# ---------- Conjuntos de códigos (validación al insertar) ----------
+
+_cache_codigos: Dict[str, Tuple[Any, Set[str]]] = {}
+
+def _codigos(path: str) -> Set[str]:
+    """Códigos presentes en un archivo, releído solo si el archivo cambió."""
+    firma = storage.firma(path)
+    en_cache = _cache_codigos.get(path)
+    if en_cache is None or en_cache[0] != firma:
+        codigos = {d.get("codigo") for d in storage.load_list(path) if isinstance(d, dict)}
+        en_cache = (firma, codigos)
+        _cache_codigos[path] = en_cache
+    return en_cache[1]
+
+def codigos_estudiantes() -> Set[str]:
+    return _codigos(storage.ESTUDIANTES_FILE)
+
+def codigos_cursos() -> Set[str]:
+    return _codigos(storage.CURSOS_FILE)
+
+def validar_referencias(estudiante_codigo: str, curso_codigo: str) -> None:
+    """Lanza ValueError si el estudiante o el curso referenciados no existen."""
+    if estudiante_codigo not in codigos_estudiantes():
+        raise ValueError(f"El estudiante con código {estudiante_codigo} no existe.")
+    if curso_codigo not in codigos_cursos():
+        raise ValueError(f"El curso con código {curso_codigo} no existe.")
+
+# ---------- Escaneo masivo ----------
+
+@dataclass
+class InformeIntegridad:
+    """
+    Resultado del escaneo. Cada problema es (posición en registros, descripción).
+    Los posibles duplicados (notas iguales del mismo estudiante y curso) son
+    informativos: pueden ser evaluaciones distintas y no cuentan como error.
+    """
+    total: int = 0
+    huerfanos: List[Tuple[int, str]] = field(default_factory=list)
+    duplicados: List[Tuple[int, str]] = field(default_factory=list)
+    malformados: List[Tuple[int, str]] = field(default_factory=list)
+    posibles_duplicados: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def correcto(self) -> bool:
+        return not (self.huerfanos or self.duplicados or self.malformados)
+
+    def resumen(self, max_ejemplos: int = 10) -> str:
+        lineas = [
+            "VERIFICACIÓN DE INTEGRIDAD\n",
+            f"Registros analizados: {self.total}",
+            f"Huérfanos: {len(self.huerfanos)}",
+            f"Duplicados: {len(self.duplicados)}",
+            f"Malformados: {len(self.malformados)}",
+            f"Posibles duplicados (notas iguales, no es error): {len(self.posibles_duplicados)}",
+        ]
+        for titulo, problemas in (
+            ("Huérfanos", self.huerfanos),
+            ("Duplicados", self.duplicados),
+            ("Malformados", self.malformados),
+            ("Posibles duplicados", self.posibles_duplicados),
+        ):
+            if problemas:
+                lineas.append(f"\n{titulo} (primeros {min(max_ejemplos, len(problemas))}):")
+                lineas.extend(f"  #{pos}: {motivo}" for pos, motivo in problemas[:max_ejemplos])
+        return "\n".join(lineas)
+
+
+def _es_fecha(valor: Any, validas: Set[str]) -> bool:
+    if valor in validas:
+        return True
+    if not isinstance(valor, str) or len(valor) != 10:
+        return False
+    try:
+        date.fromisoformat(valor)
+    except ValueError:
+        return False
+    validas.add(valor)
+    return True
+
+def _es_codigo(valor: Any) -> bool:
+    return isinstance(valor, str) and bool(valor)
+
+def escanear(registros: Optional[Iterable[Any]] = None,
+             estudiantes: Optional[Set[str]] = None,
+             cursos: Optional[Set[str]] = None) -> InformeIntegridad:
+    """
+    Recorre los registros crudos (diccionarios) una sola vez. Las referencias se
+    comprueban contra conjuntos de códigos. Una asistencia repetida para el mismo
+    (estudiante, curso, fecha) es un duplicado; una nota idéntica a otra del mismo
+    estudiante y curso solo se informa como posible duplicado, porque un
+    estudiante puede tener varias notas iguales en un curso.
+    """
+    if registros is None:
+        registros = storage.load_list(storage.REGISTROS_FILE)
+    if estudiantes is None:
+        estudiantes = codigos_estudiantes()
+    if cursos is None:
+        cursos = codigos_cursos()
+
+    informe = InformeIntegridad()
+    vistos: Set[Tuple[Any, ...]] = set()
+    fechas_validas: Set[str] = set()
+
+    for pos, d in enumerate(registros):
+        informe.total += 1
+        if not isinstance(d, dict):
+            informe.malformados.append((pos, "no es un objeto"))
+            continue
+
+        tipo = d.get("tipo")
+        est = d.get("estudiante_codigo")
+        curso = d.get("curso_codigo")
+
+        if tipo == "nota":
+            nota = d.get("nota")
+            if not (_es_codigo(est) and _es_codigo(curso)):
+                informe.malformados.append((pos, "nota sin estudiante o curso"))
+                continue
+            if isinstance(nota, bool) or not isinstance(nota, (int, float)) or not 0 <= nota <= 20:
+                informe.malformados.append((pos, f"nota inválida: {nota!r}"))
+                continue
+            clave = ("nota", est, curso, nota)
+        elif tipo == "asistencia":
+            fecha = d.get("fecha")
+            if not (_es_codigo(est) and _es_codigo(curso)):
+                informe.malformados.append((pos, "asistencia sin estudiante o curso"))
+                continue
+            if not _es_fecha(fecha, fechas_validas):
+                informe.malformados.append((pos, f"fecha inválida: {fecha!r}"))
+                continue
+            if not isinstance(d.get("presente"), bool):
+                informe.malformados.append((pos, f"presente inválido: {d.get('presente')!r}"))
+                continue
+            clave = ("asistencia", est, curso, fecha)
+        else:
+            informe.malformados.append((pos, f"tipo desconocido: {tipo!r}"))
+            continue
+
+        if est not in estudiantes:
+            informe.huerfanos.append((pos, f"estudiante inexistente {est} ({tipo}, curso {curso})"))
+        if curso not in cursos:
+            informe.huerfanos.append((pos, f"curso inexistente {curso} ({tipo}, estudiante {est})"))
+
+        if clave in vistos:
+            destino = informe.posibles_duplicados if tipo == "nota" else informe.duplicados
+            destino.append((pos, f"{tipo} repetida: {est} / {curso} / {clave[3]}"))
+        else:
+            vistos.add(clave)
+
+    return informe
+
+
+def main() -> int:
+    """Uso: python -m core.integrity  (devuelve 1 si encuentra problemas)."""
+    informe = escanear()
+    print(informe.resumen())
+    return 0 if informe.correcto else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Fila = Dict[str, Any]
+
+# ---------- Página de resultados ----------
+
+@dataclass
+class Pagina(Generic[T]):
+    """Porción de una lista junto con el cursor para pedir la siguiente."""
+    elementos: List[T] = field(default_factory=list)
+    total: int = 0
+    siguiente_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return iter(self.elementos)
+
+    def __len__(self) -> int:
+        return len(self.elementos)
+
+# ---------- Cursores ----------
+#
+# Un cursor codifica la clave de orden del último elemento entregado:
+# (valor del campo de orden, posición de inserción). La posición desempata
+# valores repetidos y no cambia al agregar nuevos elementos, así que el cursor
+# sigue siendo válido aunque la lista crezca entre una página y otra.
+
+def codificar_cursor(clave: Tuple[Any, int]) -> str:
+    texto = json.dumps(list(clave), ensure_ascii=False)
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii")
+
+def decodificar_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        valor, pos = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (valor, int(pos))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor de paginación inválido: {cursor!r}") from e
+
+def paginar(
+    filas: List[Fila],
+    limite: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    orden: Optional[str] = None,
+    descendente: bool = False,
+    filtro: Optional[Callable[[Fila], bool]] = None,
+) -> Pagina[Fila]:
+    """
+    Pagina una lista de diccionarios crudos (antes de convertirlos a modelos).
+    Sin 'orden' se respeta el orden de inserción. Si se pasa 'cursor', la página
+    empieza justo después del elemento que lo generó y 'offset' se aplica desde ahí.
+    """
+    return IndicePaginas(filas, orden, descendente, filtro).pagina(limite, offset, cursor)
+
+class IndicePaginas:
+    """
+    Filas ya filtradas y ordenadas. Se arma una vez; cada página después es una
+    búsqueda binaria del cursor y un corte de la lista.
+    """
+
+    def __init__(self, filas: List[Fila], orden: Optional[str] = None, descendente: bool = False,
+                 filtro: Optional[Callable[[Fila], bool]] = None):
+        self.filas = filas
+        self.descendente = descendente
+        self.claves = _claves_ordenadas(filas, orden, descendente, filtro)
+        # Las claves son únicas (incluyen la posición): en orden descendente la
+        # lista es exactamente la ascendente al revés.
+        self._ascendentes = [_clave_comparable(c) for c in self.claves]
+        if descendente:
+            self._ascendentes.reverse()
+
+    def pagina(self, limite: int, offset: int = 0, cursor: Optional[str] = None) -> Pagina[Fila]:
+        if limite <= 0:
+            raise ValueError("El límite de la página debe ser mayor que cero.")
+
+        claves = self.claves
+        inicio = 0
+        if cursor is not None:
+            clave_ultima = _clave_comparable(decodificar_cursor(cursor))
+            if self.descendente:
+                inicio = len(claves) - bisect_left(self._ascendentes, clave_ultima)
+            else:
+                inicio = bisect_right(self._ascendentes, clave_ultima)
+        inicio += max(offset, 0)
+
+        seleccion = claves[inicio:inicio + limite]
+        siguiente = None
+        if inicio + limite < len(claves) and seleccion:
+            siguiente = codificar_cursor(seleccion[-1])
+        return Pagina(
+            elementos=[self.filas[pos] for _, pos in seleccion],
+            total=len(claves),
+            siguiente_cursor=siguiente,
+        )
+
+@lru_cache(maxsize=32)
+def filtro_busqueda(texto: str, campos: Tuple[str, ...]) -> Optional[Callable[[Fila], bool]]:
+    """
+    Filtro "texto contenido en alguno de los campos" (sin distinguir mayúsculas).
+    Devuelve siempre el mismo objeto para los mismos argumentos, así la caché de
+    páginas de storage lo reconoce entre una página y la siguiente.
+    """
+    texto = texto.upper()
+    if not texto:
+        return None
+    return lambda f: any(texto in str(f.get(k, "")).upper() for k in campos)
+
+def _clave_comparable(clave: Tuple[Any, int]):
+    valor, pos = clave
+    return (valor is None, valor, pos)
+
+def _claves_ordenadas(filas: List[Fila], orden: Optional[str], descendente: bool,
+                      filtro: Optional[Callable[[Fila], bool]]) -> List[Tuple[Any, int]]:
+    """Claves (valor de orden, posición) de las filas que pasan el filtro, ya ordenadas."""
+    claves = [
+        ((f.get(orden) if orden else pos), pos)
+        for pos, f in enumerate(filas)
+        if filtro is None or filtro(f)
+    ]
+    if orden:
+        claves.sort(key=_clave_comparable, reverse=descendente)
+    elif descendente:
+        claves.reverse()
+    return claves
+
+def iterar_bloques(
+    filas: List[Fila],
+    tamano: int,
+    orden: Optional[str] = None,
+    descendente: bool = False,
+    filtro: Optional[Callable[[Fila], bool]] = None,
+) -> Iterator[List[Fila]]:
+    """
+    Recorre la lista completa en bloques de 'tamano' filas, con el mismo orden
+    que paginar(). Filtra y ordena una sola vez, no una vez por página.
+    """
+    if tamano <= 0:
+        raise ValueError("El tamaño de página debe ser mayor que cero.")
+    claves = _claves_ordenadas(filas, orden, descendente, filtro)
+    for inicio in range(0, len(claves), tamano):
+        yield [filas[pos] for _, pos in claves[inicio:inicio + tamano]]
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .models import Registro, RegistroNota, RegistroAsistencia
+from . import storage
+
+# ---------- Índices sobre registros ----------
+
+class IndiceRegistros:
+    """
+    Índices en memoria sobre la lista de registros. Todas las entradas guardan
+    la posición del registro en la lista original (orden de inserción).
+    """
+
+    def __init__(self, registros: List[Registro]):
+        self.registros = registros
+        self.por_tipo: Dict[str, List[int]] = {}
+        self.por_estudiante: Dict[str, List[int]] = {}
+        self.por_curso: Dict[str, List[int]] = {}
+        fechas: List[Tuple[str, int]] = []
+        notas: List[Tuple[float, int]] = []
+
+        for pos, r in enumerate(registros):
+            self.por_tipo.setdefault(r.get_tipo(), []).append(pos)
+            self.por_estudiante.setdefault(r.estudiante_codigo, []).append(pos)
+            self.por_curso.setdefault(r.curso_codigo, []).append(pos)
+            if isinstance(r, RegistroAsistencia):
+                fechas.append((r.fecha, pos))
+            elif isinstance(r, RegistroNota):
+                notas.append((float(r.nota), pos))
+
+        fechas.sort()
+        notas.sort()
+        self.fechas = fechas
+        self.notas = notas
+
+    def __len__(self) -> int:
+        return len(self.registros)
+
+    @staticmethod
+    def _rango(ordenados: List[Tuple[Any, int]], minimo: Any, maximo: Any) -> Tuple[int, int]:
+        ini = bisect_left(ordenados, (minimo, -1)) if minimo is not None else 0
+        fin = bisect_right(ordenados, (maximo, float("inf"))) if maximo is not None else len(ordenados)
+        return ini, max(ini, fin)
+
+
+_indice: Optional[IndiceRegistros] = None
+_firma_indice = None
+
+def indice_registros() -> IndiceRegistros:
+    """Índice de registros.json, reconstruido solo cuando el archivo cambia."""
+    global _indice, _firma_indice
+    firma = storage.firma(storage.REGISTROS_FILE)
+    if _indice is None or firma != _firma_indice:
+        _indice = IndiceRegistros(storage.load_registros())
+        _firma_indice = firma
+    return _indice
+
+# ---------- Plan y resultado ----------
+
+@dataclass
+class PlanConsulta:
+    """Explica cómo se resolvió una consulta, para diagnosticar consultas lentas."""
+    acceso: str                 # "indice:curso", "rango:fecha", "scan", ...
+    clave: Any = None
+    total: int = 0              # registros en la fuente
+    examinados: int = 0         # registros evaluados contra los filtros
+    devueltos: int = 0
+    alternativas: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        clave = f" = {self.clave!r}" if self.clave is not None else ""
+        return (
+            f"{self.acceso}{clave}: examinados {self.examinados} de {self.total}, "
+            f"devueltos {self.devueltos}"
+        )
+
+@dataclass
+class ResultadoConsulta:
+    filas: List[Any]
+    plan: PlanConsulta
+
+    def __iter__(self):
+        return iter(self.filas)
+
+    def __len__(self) -> int:
+        return len(self.filas)
+
+    def copias(self) -> List[Any]:
+        """Filas que el llamador puede modificar sin tocar el índice compartido."""
+        return [dict(f) if isinstance(f, dict) else replace(f) for f in self.filas]
+
+# ---------- Consulta ----------
+
+class Consulta:
+    """
+    Constructor de consultas sobre registros.
+
+        Consulta().tipo("nota").curso("MAT101").nota_entre(11, 20) \\
+            .ordenar_por("nota", descendente=True).limite(10).ejecutar()
+
+    Los registros devueltos son los del índice compartido: no deben modificarse
+    (ResultadoConsulta.copias() entrega copias independientes).
+    """
+
+    def __init__(self):
+        self._tipo: Optional[str] = None
+        self._estudiante: Optional[str] = None
+        self._curso: Optional[str] = None
+        self._fecha: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._nota: Tuple[Optional[float], Optional[float]] = (None, None)
+        self._extras: List[Callable[[Registro], bool]] = []
+        self._campos: Optional[Tuple[str, ...]] = None
+        self._orden: Optional[str] = None
+        self._descendente = False
+        self._limite: Optional[int] = None
+
+    # ---------- Filtros ----------
+
+    def tipo(self, tipo: str) -> "Consulta":
+        """'nota' o 'asistencia'."""
+        self._tipo = tipo
+        return self
+
+    def estudiante(self, codigo: str) -> "Consulta":
+        self._estudiante = codigo
+        return self
+
+    def curso(self, codigo: str) -> "Consulta":
+        self._curso = codigo
+        return self
+
+    def fecha_entre(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> "Consulta":
+        """Rango inclusivo de fechas YYYY-MM-DD; implica registros de asistencia."""
+        self._fecha = (desde, hasta)
+        return self
+
+    def nota_entre(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> "Consulta":
+        """Rango inclusivo de notas; implica registros de nota."""
+        self._nota = (minimo, maximo)
+        return self
+
+    def donde(self, predicado: Callable[[Registro], bool]) -> "Consulta":
+        """Filtro adicional arbitrario (no usa índices)."""
+        self._extras.append(predicado)
+        return self
+
+    # ---------- Forma del resultado ----------
+
+    def seleccionar(self, *campos: str) -> "Consulta":
+        """Proyección: devuelve diccionarios solo con los campos indicados."""
+        self._campos = campos
+        return self
+
+    def ordenar_por(self, campo: str, descendente: bool = False) -> "Consulta":
+        self._orden = campo
+        self._descendente = descendente
+        return self
+
+    def limite(self, n: int) -> "Consulta":
+        self._limite = n
+        return self
+
+    # ---------- Planificación ----------
+
+    def _candidatos(self, indice: IndiceRegistros) -> Dict[str, Tuple[Any, Callable[[], List[int]], int]]:
+        """Accesos posibles: nombre -> (clave, generador de posiciones, tamaño)."""
+        opciones: Dict[str, Tuple[Any, Callable[[], List[int]], int]] = {}
+
+        def por_clave(nombre: str, mapa: Dict[str, List[int]], clave: str):
+            posiciones = mapa.get(clave, [])
+            opciones[nombre] = (clave, lambda: posiciones, len(posiciones))
+
+        def por_rango(nombre: str, ordenados: List[Tuple[Any, int]], rango: Tuple[Any, Any]):
+            ini, fin = indice._rango(ordenados, *rango)
+            opciones[nombre] = (
+                rango, lambda: sorted(pos for _, pos in ordenados[ini:fin]), fin - ini
+            )
+
+        if self._estudiante is not None:
+            por_clave("indice:estudiante", indice.por_estudiante, self._estudiante)
+        if self._curso is not None:
+            por_clave("indice:curso", indice.por_curso, self._curso)
+        if self._tipo is not None:
+            por_clave("indice:tipo", indice.por_tipo, self._tipo)
+        if self._fecha != (None, None):
+            por_rango("rango:fecha", indice.fechas, self._fecha)
+        if self._nota != (None, None):
+            por_rango("rango:nota", indice.notas, self._nota)
+        return opciones
+
+    def _coincide(self, r: Registro) -> bool:
+        if self._tipo is not None and r.get_tipo() != self._tipo:
+            return False
+        if self._estudiante is not None and r.estudiante_codigo != self._estudiante:
+            return False
+        if self._curso is not None and r.curso_codigo != self._curso:
+            return False
+        if self._fecha != (None, None):
+            if not isinstance(r, RegistroAsistencia):
+                return False
+            desde, hasta = self._fecha
+            if (desde is not None and r.fecha < desde) or (hasta is not None and r.fecha > hasta):
+                return False
+        if self._nota != (None, None):
+            if not isinstance(r, RegistroNota):
+                return False
+            minimo, maximo = self._nota
+            if (minimo is not None and r.nota < minimo) or (maximo is not None and r.nota > maximo):
+                return False
+        return all(p(r) for p in self._extras)
+
+    def _planificar(self, indice: IndiceRegistros) -> Tuple[PlanConsulta, Callable[[], Any]]:
+        """Elige el acceso más selectivo; 'examinados' queda como estimación."""
+        opciones = self._candidatos(indice)
+        if not opciones:
+            plan = PlanConsulta("scan", total=len(indice), examinados=len(indice))
+            return plan, lambda: range(len(indice))
+        nombre = min(opciones, key=lambda n: opciones[n][2])
+        clave, posiciones, tamano = opciones[nombre]
+        plan = PlanConsulta(
+            nombre, clave, total=len(indice), examinados=tamano,
+            alternativas={n: o[2] for n, o in opciones.items()},
+        )
+        return plan, posiciones
+
+    def explicar(self, indice: Optional[IndiceRegistros] = None) -> PlanConsulta:
+        """Plan elegido, sin ejecutar la consulta."""
+        return self._planificar(indice or indice_registros())[0]
+
+    # ---------- Ejecución ----------
+
+    def ejecutar(self, indice: Optional[IndiceRegistros] = None) -> ResultadoConsulta:
+        indice = indice or indice_registros()
+        plan, generar_posiciones = self._planificar(indice)
+        posiciones = generar_posiciones()
+
+        registros = indice.registros
+        corta_en_limite = self._orden is None and self._limite is not None
+        filas: List[Registro] = []
+        examinados = 0
+        for pos in posiciones:
+            examinados += 1
+            r = registros[pos]
+            if self._coincide(r):
+                filas.append(r)
+                if corta_en_limite and len(filas) >= self._limite:
+                    break
+
+        if self._orden is not None:
+            campo = self._orden
+            con_valor = [r for r in filas if hasattr(r, campo)]
+            sin_valor = [r for r in filas if not hasattr(r, campo)]
+            con_valor.sort(key=lambda r: getattr(r, campo), reverse=self._descendente)
+            filas = con_valor + sin_valor
+        if self._limite is not None:
+            filas = filas[:self._limite]
+
+        plan.examinados = examinados
+        plan.devueltos = len(filas)
+        if self._campos is not None:
+            filas = [{c: getattr(r, c, None) for c in self._campos} for r in filas]
+        return ResultadoConsulta(filas, plan)
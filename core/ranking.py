@@ -0,0 +1,107 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Registro, RegistroNota
+
+# ---------- Ranking por curso ----------
+#
+# Cada estudiante se ordena por el promedio de sus notas en el curso. Por curso
+# se mantiene una lista ordenada de (-promedio, estudiante) y, en paralelo, la
+# lista de claves -promedio, de modo que posición y percentil salen de dos
+# búsquedas binarias. Las notas tienen a lo sumo dos decimales y se acumulan en
+# centésimas enteras: dos promedios iguales dan exactamente la misma clave y
+# comparten posición, cosa que no garantiza sumar floats en distinto orden.
+
+@dataclass
+class PosicionRanking:
+    posicion: int
+    estudiante_codigo: str
+    promedio: float
+    cantidad_notas: int
+
+
+class _RankingCurso:
+    def __init__(self):
+        self.acumulado: Dict[str, Tuple[int, int]] = {}     # estudiante -> (suma en centésimas, cantidad)
+        self.entradas: List[Tuple[float, str]] = []         # (-promedio en centésimas, estudiante)
+        self.claves: List[float] = []                       # -promedio en centésimas, mismo orden
+
+    def agregar(self, estudiante_codigo: str, nota: float):
+        suma, n = self.acumulado.get(estudiante_codigo, (0, 0))
+        if n:
+            entrada = (-(suma / n), estudiante_codigo)
+            i = bisect_left(self.entradas, entrada)
+            del self.entradas[i]
+            del self.claves[i]
+        suma, n = suma + round(nota * 100), n + 1
+        self.acumulado[estudiante_codigo] = (suma, n)
+        entrada = (-(suma / n), estudiante_codigo)
+        i = bisect_left(self.entradas, entrada)
+        self.entradas.insert(i, entrada)
+        self.claves.insert(i, entrada[0])
+
+    def clave(self, estudiante_codigo: str) -> Optional[float]:
+        """-promedio en centésimas (la clave de orden), o None si no tiene notas."""
+        suma, n = self.acumulado.get(estudiante_codigo, (0, 0))
+        return -(suma / n) if n else None
+
+
+class RankingCursos:
+    """Ranking de estudiantes por promedio, mantenido incrementalmente por curso."""
+
+    def __init__(self):
+        self._cursos: Dict[str, _RankingCurso] = {}
+
+    @classmethod
+    def desde_registros(cls, registros: Iterable[Registro]) -> "RankingCursos":
+        ranking = cls()
+        for r in registros:
+            if isinstance(r, RegistroNota):
+                ranking.agregar(r)
+        return ranking
+
+    def agregar(self, registro: RegistroNota):
+        self._cursos.setdefault(registro.curso_codigo, _RankingCurso()).agregar(
+            registro.estudiante_codigo, float(registro.nota)
+        )
+
+    def cursos(self) -> List[str]:
+        return list(self._cursos)
+
+    def top(self, curso_codigo: str, k: Optional[int] = None) -> List[PosicionRanking]:
+        """Los k mejores del curso (todos si k es None). Empates comparten posición."""
+        curso = self._cursos.get(curso_codigo)
+        if curso is None:
+            return []
+        entradas = curso.entradas if k is None else curso.entradas[:k]
+        resultado = []
+        for i, (clave, est) in enumerate(entradas):
+            posicion = i + 1 if i == 0 or clave != entradas[i - 1][0] else resultado[-1].posicion
+            resultado.append(PosicionRanking(posicion, est, -clave / 100, curso.acumulado[est][1]))
+        return resultado
+
+    def posicion(self, estudiante_codigo: str, curso_codigo: str) -> Optional[int]:
+        """Puesto del estudiante (1 = mejor promedio), o None si no tiene notas."""
+        curso = self._cursos.get(curso_codigo)
+        clave = curso.clave(estudiante_codigo) if curso else None
+        if clave is None:
+            return None
+        return bisect_left(curso.claves, clave) + 1
+
+    def percentil(self, estudiante_codigo: str, curso_codigo: str) -> Optional[float]:
+        """
+        Percentil (0–100) del estudiante en el curso: porcentaje de compañeros con
+        promedio menor, contando los empates como la mitad.
+        """
+        curso = self._cursos.get(curso_codigo)
+        clave = curso.clave(estudiante_codigo) if curso else None
+        if clave is None:
+            return None
+        n = len(curso.claves)
+        mejores = bisect_left(curso.claves, clave)
+        fin_empate = bisect_right(curso.claves, clave)
+        debajo = n - fin_empate
+        empatados = fin_empate - mejores
+        return 100 * (debajo + 0.5 * empatados) / n
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from .models import Registro, RegistroNota, RegistroAsistencia
+from .ranking import RankingCursos
 
 class Reporte(ABC):
     @abstractmethod
@@ -30,3 +31,20 @@ class ReporteAsistencias(Reporte):
                     f"Curso: {r.curso_codigo} | {estado}"
                 )
         return "\n".join(lineas)
+
+class ReporteRanking(Reporte):
+    """Ranking por curso según el promedio de notas; 'limite' restringe a los N primeros."""
+    def __init__(self, limite: Optional[int] = None):
+        self.limite = limite
+
+    def generar(self, registros: List[Registro]) -> str:
+        lineas = ["REPORTE DE RANKING\n"]
+        ranking = RankingCursos.desde_registros(registros)
+        for curso in sorted(ranking.cursos()):
+            lineas.append(f"Curso: {curso}")
+            for p in ranking.top(curso, self.limite):
+                lineas.append(
+                    f"  {p.posicion}. Est: {p.estudiante_codigo} | "
+                    f"Promedio: {p.promedio:.2f} | Notas: {p.cantidad_notas}"
+                )
+        return "\n".join(lineas)
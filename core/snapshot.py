@@ -0,0 +1,233 @@
+from __future__ import annotations
+import mmap
+from array import array
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Registro, RegistroNota, RegistroAsistencia
+from . import storage
+
+# ---------- Snapshot de solo lectura de registros ----------
+#
+# Archivo pensado para reportes y estadísticas: se abre con mmap, de modo que
+# una consulta por curso o estudiante solo lee las páginas que necesita y varios
+# procesos comparten la misma caché de páginas del sistema operativo.
+#
+#   Cabecera   _CABECERA (ver abajo), incluye la firma de registros.json de origen
+#   Cadenas    "<H" longitud + UTF-8 (códigos y fechas)
+#   Registros  _REGISTRO, ancho fijo, en el orden original
+#   Directorio "<III" por curso y por estudiante: cadena, inicio, cantidad
+#   Posiciones "<I" números de registro, agrupados según el directorio
+
+SNAPSHOT_FILE = os.path.join(storage.DATA_DIR, "registros.snap")
+
+MAGIA = b"SNAP"
+VERSION = 1
+# magia, versión, mtime_ns y tamaño de origen, nº cadenas, nº registros,
+# nº entradas de curso, nº entradas de estudiante, offsets de cada sección
+_CABECERA = struct.Struct("<4sBQQIIIIQQQQ")
+_LONGITUD = struct.Struct("<H")
+# tipo (0 nota, 1 asistencia), presente, estudiante, curso, fecha, nota
+_REGISTRO = struct.Struct("<BBxxIIId")
+_ENTRADA = struct.Struct("<III")
+_SIN_FECHA = 0xFFFFFFFF
+
+
+def escribir_snapshot(ruta: str = SNAPSHOT_FILE,
+                      registros: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Genera el snapshot a partir de registros.json. Devuelve la cantidad de registros."""
+    firma_origen = storage.firma(storage.REGISTROS_FILE)
+    if registros is None:
+        registros = storage.load_list(storage.REGISTROS_FILE)
+
+    indices: Dict[str, int] = {}
+    def idx(texto: str) -> int:
+        i = indices.get(texto)
+        if i is None:
+            i = indices[texto] = len(indices)
+        return i
+
+    cuerpo = bytearray()
+    por_curso: Dict[int, List[int]] = {}
+    por_estudiante: Dict[int, List[int]] = {}
+    n = 0
+    for d in registros:
+        tipo = d.get("tipo")
+        if tipo not in ("nota", "asistencia"):
+            continue
+        est = idx(d["estudiante_codigo"])
+        curso = idx(d["curso_codigo"])
+        if tipo == "nota":
+            cuerpo += _REGISTRO.pack(0, 0, est, curso, _SIN_FECHA, float(d["nota"]))
+        else:
+            cuerpo += _REGISTRO.pack(1, bool(d["presente"]), est, curso, idx(d["fecha"]), 0.0)
+        por_curso.setdefault(curso, []).append(n)
+        por_estudiante.setdefault(est, []).append(n)
+        n += 1
+
+    cadenas = bytearray()
+    for texto in indices:
+        codificado = texto.encode("utf-8")
+        cadenas += _LONGITUD.pack(len(codificado)) + codificado
+
+    def seccion_indice(grupos: Dict[int, List[int]]) -> Tuple[bytes, bytes]:
+        directorio = bytearray()
+        posiciones = array("I")
+        for clave, lista in grupos.items():
+            directorio += _ENTRADA.pack(clave, len(posiciones), len(lista))
+            posiciones.extend(lista)
+        if sys.byteorder == "big":
+            posiciones.byteswap()
+        return bytes(directorio), posiciones.tobytes()
+
+    dir_curso, pos_curso = seccion_indice(por_curso)
+    dir_est, pos_est = seccion_indice(por_estudiante)
+
+    off_cadenas = _CABECERA.size
+    off_registros = off_cadenas + len(cadenas)
+    off_indice_curso = off_registros + len(cuerpo)
+    off_indice_est = off_indice_curso + len(dir_curso) + len(pos_curso)
+    cabecera = _CABECERA.pack(
+        MAGIA, VERSION, firma_origen[0], firma_origen[1], len(indices), n,
+        len(por_curso), len(por_estudiante),
+        off_cadenas, off_registros, off_indice_curso, off_indice_est,
+    )
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        for parte in (cabecera, cadenas, cuerpo, dir_curso, pos_curso, dir_est, pos_est):
+            f.write(parte)
+    # En Windows no se puede reemplazar un archivo que sigue mapeado.
+    _cerrar_abierto()
+    os.replace(temporal, ruta)
+    return n
+
+
+class SnapshotRegistros:
+    """Vista de solo lectura sobre un snapshot mapeado en memoria."""
+
+    def __init__(self, ruta: str = SNAPSHOT_FILE):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._archivo.close()
+            raise
+
+        (magia, version, mtime, tamano, n_cadenas, self.total, n_cursos, n_est,
+         off_cadenas, self._off_registros, off_curso, off_est) = _CABECERA.unpack_from(self._mm)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un snapshot de registros compatible.")
+        self.firma_origen = (mtime, tamano)
+
+        # La tabla de cadenas y los directorios son pequeños: se leen al abrir.
+        self._cadenas: List[str] = []
+        pos = off_cadenas
+        for _ in range(n_cadenas):
+            (largo,) = _LONGITUD.unpack_from(self._mm, pos)
+            pos += _LONGITUD.size
+            self._cadenas.append(self._mm[pos:pos + largo].decode("utf-8"))
+            pos += largo
+        self._codigos = {c: i for i, c in enumerate(self._cadenas)}
+        self._dir_curso = self._leer_directorio(off_curso, n_cursos)
+        self._dir_est = self._leer_directorio(off_est, n_est)
+
+    def _leer_directorio(self, offset: int, n: int) -> Tuple[Dict[int, Tuple[int, int]], int]:
+        entradas = {
+            clave: (inicio, cantidad)
+            for clave, inicio, cantidad in _ENTRADA.iter_unpack(
+                self._mm[offset:offset + n * _ENTRADA.size]
+            )
+        }
+        return entradas, offset + n * _ENTRADA.size
+
+    # ---------- Acceso ----------
+
+    def vigente(self) -> bool:
+        """True si registros.json no cambió desde que se generó el snapshot."""
+        return self.firma_origen == storage.firma(storage.REGISTROS_FILE)
+
+    def _registro(self, i: int) -> Registro:
+        tipo, presente, est, curso, fecha, nota = _REGISTRO.unpack_from(
+            self._mm, self._off_registros + i * _REGISTRO.size
+        )
+        if tipo == 0:
+            return RegistroNota(self._cadenas[est], self._cadenas[curso], nota)
+        return RegistroAsistencia(
+            self._cadenas[est], self._cadenas[curso], self._cadenas[fecha], bool(presente)
+        )
+
+    def _posiciones(self, directorio, codigo: str) -> List[int]:
+        entradas, off_posiciones = directorio
+        clave = self._codigos.get(codigo)
+        if clave is None or clave not in entradas:
+            return []
+        inicio, cantidad = entradas[clave]
+        return list(struct.unpack_from(f"<{cantidad}I", self._mm, off_posiciones + inicio * 4))
+
+    def _filtrar(self, posiciones: List[int], tipo: Optional[str]) -> List[Registro]:
+        registros = [self._registro(i) for i in posiciones]
+        if tipo is None:
+            return registros
+        return [r for r in registros if r.get_tipo() == tipo]
+
+    def por_curso(self, curso_codigo: str, tipo: Optional[str] = None) -> List[Registro]:
+        return self._filtrar(self._posiciones(self._dir_curso, curso_codigo), tipo)
+
+    def por_estudiante(self, estudiante_codigo: str, tipo: Optional[str] = None) -> List[Registro]:
+        return self._filtrar(self._posiciones(self._dir_est, estudiante_codigo), tipo)
+
+    def cerrar(self):
+        self._mm.close()
+        self._archivo.close()
+
+    def __enter__(self) -> "SnapshotRegistros":
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+_abierto: Optional[SnapshotRegistros] = None
+_firma_abierto = None
+
+def _cerrar_abierto():
+    """Libera el snapshot compartido (mmap y archivo) de este proceso."""
+    global _abierto, _firma_abierto
+    if _abierto is not None:
+        _abierto.cerrar()
+        _abierto = None
+        _firma_abierto = None
+
+def snapshot_vigente(ruta: str = SNAPSHOT_FILE) -> Optional[SnapshotRegistros]:
+    """
+    Snapshot compartido si existe y corresponde al registros.json actual;
+    None si hay que recurrir a los datos completos.
+    """
+    global _abierto, _firma_abierto
+    firma = storage.firma(ruta)
+    if _abierto is not None and (firma != _firma_abierto or _abierto.ruta != ruta):
+        _cerrar_abierto()
+    if _abierto is None:
+        if firma == (0, 0):
+            return None
+        try:
+            _abierto = SnapshotRegistros(ruta)
+        except (OSError, ValueError, struct.error):
+            return None
+        _firma_abierto = firma
+    return _abierto if _abierto.vigente() else None
+
+
+def main() -> int:
+    """Uso: python -m core.snapshot  (regenera data/registros.snap)."""
+    n = escribir_snapshot()
+    print(f"Snapshot generado en {SNAPSHOT_FILE}: {n} registros.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
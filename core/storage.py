@@ -1,36 +1,229 @@
+import base64
 import json
 import os
-from typing import List, Dict, Any, Type, TypeVar
+import struct
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Type, TypeVar
 from contextlib import contextmanager
+from functools import lru_cache
 
 from .models import (
     Estudiante, Docente, Curso,
     RegistroNota, RegistroAsistencia, Registro
 )
+from .pagination import Pagina, IndicePaginas, iterar_bloques
 
 T = TypeVar("T")
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
-@contextmanager
-def open_json(path: str, mode: str):
-    """Context manager para abrir JSON con seguridad."""
-    with open(path, mode, encoding="utf-8") as f:
-        yield f
+# ---------- Codecs ----------
+# Un codec convierte la lista de diccionarios de un archivo a bytes y viceversa.
+# Al leer, el formato se detecta por la cabecera. Al guardar se conserva el
+# formato que ya tiene el archivo (JSON si no existe), salvo que se haya fijado
+# otro con usar_codec().
 
-def load_list(path: str) -> List[Dict[str, Any]]:
-    if not os.path.exists(path):
-        return []
-    with open_json(path, "r") as f:
+class Codec(ABC):
+    nombre: str = ""
+
+    @abstractmethod
+    def encode(self, data: List[Dict[str, Any]]) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, datos: bytes) -> List[Dict[str, Any]]:
+        ...
+
+    def reconoce(self, cabecera: bytes) -> bool:
+        """Indica si los primeros bytes de un archivo corresponden a este formato."""
+        return False
+
+class CodecJSON(Codec):
+    """Formato original: JSON indentado en UTF-8."""
+    nombre = "json"
+
+    def encode(self, data: List[Dict[str, Any]]) -> bytes:
+        return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, datos: bytes) -> List[Dict[str, Any]]:
         try:
-            return json.load(f)
-        except json.JSONDecodeError:
+            return json.loads(datos)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             return []
 
+class CodecBinarioRegistros(Codec):
+    """
+    Formato binario compacto para registros (solo biblioteca estándar).
+
+    Cabecera  "<4sBIIII": magia, versión, nº de cadenas, nº de registros,
+              nº de notas, nº de asistencias
+    Cadenas   tabla de códigos y fechas: "<H" longitud + UTF-8
+    Tipos     un byte por registro (0 = nota, 1 = asistencia), en orden original
+    Notas     "<IId": estudiante, curso (índices en la tabla), nota
+    Asist.    "<IIIB": estudiante, curso, fecha (índices), presente
+
+    Solo se conservan los campos de RegistroNota/RegistroAsistencia.
+    """
+    nombre = "binario"
+    MAGIA = b"SREG"
+    VERSION = 1
+    _CABECERA = struct.Struct("<4sBIIII")
+    _LONGITUD = struct.Struct("<H")
+    _NOTA = struct.Struct("<IId")
+    _ASISTENCIA = struct.Struct("<IIIB")
+
+    def reconoce(self, cabecera: bytes) -> bool:
+        return cabecera[:4] == self.MAGIA
+
+    def encode(self, data: List[Dict[str, Any]]) -> bytes:
+        indices: Dict[str, int] = {}
+
+        def idx(texto: str) -> int:
+            i = indices.get(texto)
+            if i is None:
+                i = indices[texto] = len(indices)
+            return i
+
+        tipos = bytearray()
+        notas = bytearray()
+        asistencias = bytearray()
+        for d in data:
+            tipo = d.get("tipo")
+            est = idx(d["estudiante_codigo"])
+            curso = idx(d["curso_codigo"])
+            if tipo == "nota":
+                tipos.append(0)
+                notas += self._NOTA.pack(est, curso, float(d["nota"]))
+            elif tipo == "asistencia":
+                tipos.append(1)
+                asistencias += self._ASISTENCIA.pack(est, curso, idx(d["fecha"]), bool(d["presente"]))
+            else:
+                raise ValueError(f"Tipo de registro no soportado por el codec binario: {tipo!r}")
+
+        partes = [self._CABECERA.pack(
+            self.MAGIA, self.VERSION, len(indices), len(tipos),
+            len(notas) // self._NOTA.size, len(asistencias) // self._ASISTENCIA.size,
+        )]
+        for texto in indices:
+            codificado = texto.encode("utf-8")
+            partes.append(self._LONGITUD.pack(len(codificado)))
+            partes.append(codificado)
+        partes += [bytes(tipos), bytes(notas), bytes(asistencias)]
+        return b"".join(partes)
+
+    def decode(self, datos: bytes) -> List[Dict[str, Any]]:
+        magia, version, n_cadenas, n_registros, n_notas, n_asis = self._CABECERA.unpack_from(datos)
+        if magia != self.MAGIA or version != self.VERSION:
+            raise ValueError(f"Versión de archivo binario no soportada: {version}")
+
+        pos = self._CABECERA.size
+        cadenas: List[str] = []
+        for _ in range(n_cadenas):
+            (n,) = self._LONGITUD.unpack_from(datos, pos)
+            pos += self._LONGITUD.size
+            cadenas.append(datos[pos:pos + n].decode("utf-8"))
+            pos += n
+
+        tipos = datos[pos:pos + n_registros]
+        pos += n_registros
+        fin_notas = pos + n_notas * self._NOTA.size
+        notas = self._NOTA.iter_unpack(datos[pos:fin_notas])
+        asistencias = self._ASISTENCIA.iter_unpack(
+            datos[fin_notas:fin_notas + n_asis * self._ASISTENCIA.size]
+        )
+
+        resultado: List[Dict[str, Any]] = []
+        for tipo in tipos:
+            if tipo == 0:
+                est, curso, nota = next(notas)
+                resultado.append({
+                    "estudiante_codigo": cadenas[est], "curso_codigo": cadenas[curso],
+                    "nota": nota, "tipo": "nota",
+                })
+            else:
+                est, curso, fecha, presente = next(asistencias)
+                resultado.append({
+                    "estudiante_codigo": cadenas[est], "curso_codigo": cadenas[curso],
+                    "fecha": cadenas[fecha], "presente": bool(presente), "tipo": "asistencia",
+                })
+        return resultado
+
+CODEC_JSON = CodecJSON()
+CODEC_BINARIO = CodecBinarioRegistros()
+
+# Codecs que se prueban al leer (el primero que reconoce la cabecera); JSON si ninguno.
+CODECS_DETECTABLES: List[Codec] = [CODEC_BINARIO]
+_codec_guardado: Dict[str, Codec] = {}
+
+def usar_codec(path: str, codec: Codec):
+    """Fuerza el codec con el que se guardará el archivo a partir de ahora."""
+    _codec_guardado[os.path.normpath(path)] = codec
+
+def codec_para_guardar(path: str) -> Codec:
+    """Codec fijado con usar_codec(); si no hay, el del archivo existente."""
+    codec = _codec_guardado.get(os.path.normpath(path))
+    if codec is not None:
+        return codec
+    try:
+        with open(path, "rb") as f:
+            return detectar_codec(f.read(16))
+    except FileNotFoundError:
+        return CODEC_JSON
+
+def detectar_codec(datos: bytes) -> Codec:
+    cabecera = datos[:16]
+    for codec in CODECS_DETECTABLES:
+        if codec.reconoce(cabecera):
+            return codec
+    return CODEC_JSON
+
+def _leer_archivo(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        datos = f.read()
+    return detectar_codec(datos).decode(datos)
+
+def _escribir_atomico(path: str, datos: bytes):
+    """Escribe en un temporal y lo renombra: el archivo nunca queda a medias."""
+    temporal = path + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(datos)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, path)
+
+def load_list(path: str) -> List[Dict[str, Any]]:
+    if _transaccion_activa is not None:
+        return _transaccion_activa.leer(path)
+    recuperar_wal()
+    return _leer_archivo(path)
+
 def save_list(path: str, data: List[Dict[str, Any]]):
-    with open_json(path, "w") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    if _transaccion_activa is not None:
+        _transaccion_activa.escribir(path, data)
+        return
+    recuperar_wal()
+    _escribir_atomico(path, codec_para_guardar(path).encode(data))
+
+def firma(path: str) -> Tuple[int, int]:
+    """
+    Huella barata (mtime, tamaño) de un archivo de datos.
+    Permite a las cachés en memoria detectar si el archivo cambió sin releerlo.
+    Dentro de una transacción, un archivo modificado tiene una firma propia que
+    cambia con cada escritura.
+    """
+    if _transaccion_activa is not None:
+        version = _transaccion_activa.version(path)
+        if version is not None:
+            return (-1, version)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
 
 # Rutas básicas
 ESTUDIANTES_FILE = os.path.join(DATA_DIR, "estudiantes.json")
@@ -38,6 +231,167 @@ DOCENTES_FILE = os.path.join(DATA_DIR, "docentes.json")
 CURSOS_FILE = os.path.join(DATA_DIR, "cursos.json")
 REGISTROS_FILE = os.path.join(DATA_DIR, "registros.json")
 
+# Para convertir registros.json de formato basta con guardarlo una vez con el
+# codec deseado; después se mantiene solo:
+#   SISTEMA_CODEC_REGISTROS=binario python main.py   (o =json para volver)
+_codec_env = {c.nombre: c for c in (CODEC_JSON, CODEC_BINARIO)}.get(
+    os.environ.get("SISTEMA_CODEC_REGISTROS", "")
+)
+if _codec_env is not None:
+    usar_codec(REGISTROS_FILE, _codec_env)
+
+# ---------- Transacciones ----------
+#
+#   with storage.transaction():
+#       student_service.crear_estudiante(...)
+#       grade_service.agregar_nota(...)
+#
+# Dentro del bloque, load_list/save_list trabajan sobre copias en memoria, así
+# que los servicios participan sin cambios. Al salir se valida todo una vez y se
+# escribe cada archivo modificado una sola vez. Primero se guarda un registro de
+# escritura anticipada (WAL) con el contenido final de todos los archivos: si el
+# proceso se interrumpe mientras se reemplazan, al volver a importar el módulo
+# se completa la transacción desde el WAL. Si el bloque lanza una excepción, no
+# se escribe nada. Una vez escrito el WAL la transacción cuenta como confirmada:
+# si un reemplazo falla se reintenta desde el WAL y, si tampoco se puede, el WAL
+# queda en disco y se completa antes de la siguiente lectura o escritura.
+
+WAL_FILE = os.path.join(DATA_DIR, "transaccion.wal")
+
+_transaccion_activa: Optional["Transaccion"] = None
+_contador_versiones = 0
+
+class Transaccion:
+    def __init__(self):
+        self._originales: Dict[str, List[Dict[str, Any]]] = {}
+        self._datos: Dict[str, List[Dict[str, Any]]] = {}
+        self._versiones: Dict[str, int] = {}
+
+    def leer(self, path: str) -> List[Dict[str, Any]]:
+        clave = os.path.normpath(path)
+        if clave not in self._datos:
+            original = _leer_archivo(path)
+            self._originales[clave] = original
+            # Copia de cada fila: editar una en el lugar no debe alterar el original.
+            self._datos[clave] = [dict(d) if isinstance(d, dict) else d for d in original]
+        return list(self._datos[clave])
+
+    def escribir(self, path: str, data: List[Dict[str, Any]]):
+        global _contador_versiones
+        clave = os.path.normpath(path)
+        if clave not in self._originales:
+            self._originales[clave] = _leer_archivo(path)
+        self._datos[clave] = list(data)
+        _contador_versiones += 1
+        self._versiones[clave] = _contador_versiones
+
+    def version(self, path: str) -> Optional[int]:
+        return self._versiones.get(os.path.normpath(path))
+
+    def modificados(self) -> List[str]:
+        return list(self._versiones)
+
+    def validar(self):
+        """
+        Verifica el estado final una sola vez: códigos únicos en estudiantes y
+        cursos, y que la transacción no agregue registros huérfanos ni malformados.
+        """
+        from . import integrity
+
+        modificados = set(self.modificados())
+        for path in (ESTUDIANTES_FILE, CURSOS_FILE):
+            clave = os.path.normpath(path)
+            if clave in modificados:
+                codigos = [d.get("codigo") for d in self._datos[clave]]
+                if len(set(codigos)) != len(codigos):
+                    raise ValueError(f"Códigos repetidos en {os.path.basename(path)}.")
+
+        archivos = [os.path.normpath(p) for p in (ESTUDIANTES_FILE, CURSOS_FILE, REGISTROS_FILE)]
+        if not modificados & set(archivos):
+            return
+        def problemas(estudiantes, cursos, registros) -> Counter:
+            # Cada fila huérfana o malformada se cuenta junto con su motivo, así
+            # corregir un huérfano no habilita a introducir otro distinto.
+            informe = integrity.escanear(
+                registros, {d.get("codigo") for d in estudiantes}, {d.get("codigo") for d in cursos}
+            )
+            return Counter(
+                (motivo, json.dumps(registros[pos], sort_keys=True, ensure_ascii=False, default=repr))
+                for pos, motivo in informe.huerfanos + informe.malformados
+            )
+
+        despues = problemas(*(self.leer(p) for p in archivos))
+        if not despues:
+            return
+
+        # Solo se rechazan los problemas que introduce la transacción.
+        nuevos = despues - problemas(*(self._originales[p] for p in archivos))
+        if nuevos:
+            raise ValueError(
+                "La transacción deja registros inconsistentes:\n"
+                + "\n".join(motivo for motivo, _ in list(nuevos)[:5])
+            )
+
+    def confirmar(self):
+        """
+        Escribe el WAL, reemplaza cada archivo modificado y elimina el WAL.
+        Un error después de escribir el WAL no deshace la transacción.
+        """
+        modificados = self.modificados()
+        if not modificados:
+            return
+        contenido = {
+            path: codec_para_guardar(path).encode(self._datos[path]) for path in modificados
+        }
+        wal = json.dumps({
+            path: base64.b64encode(datos).decode("ascii") for path, datos in contenido.items()
+        })
+        _escribir_atomico(WAL_FILE, wal.encode("utf-8"))
+        try:
+            _aplicar(contenido)
+        except OSError:
+            recuperar_wal()
+
+
+def _aplicar(contenido: Dict[str, bytes]):
+    for path, datos in contenido.items():
+        _escribir_atomico(path, datos)
+    os.remove(WAL_FILE)
+
+def recuperar_wal() -> bool:
+    """Completa una transacción confirmada que no llegó a escribirse. True si había WAL."""
+    if not os.path.exists(WAL_FILE):
+        return False
+    with open(WAL_FILE, "rb") as f:
+        wal = json.loads(f.read())
+    _aplicar({path: base64.b64decode(datos) for path, datos in wal.items()})
+    return True
+
+@contextmanager
+def transaction():
+    """
+    Agrupa cargas y guardados en una unidad de trabajo. Si ya hay una transacción
+    activa, el bloque se une a ella y la escritura ocurre al cerrar la exterior.
+    """
+    global _transaccion_activa
+    if _transaccion_activa is not None:
+        yield _transaccion_activa
+        return
+
+    recuperar_wal()
+    tx = Transaccion()
+    _transaccion_activa = tx
+    try:
+        yield tx
+        tx.validar()
+    except BaseException:
+        _transaccion_activa = None
+        raise
+    _transaccion_activa = None
+    tx.confirmar()
+
+recuperar_wal()
+
 # ---------- Funciones genéricas ----------
 
 def load_estudiantes() -> List[Estudiante]:
@@ -54,15 +408,121 @@ def load_cursos() -> List[Curso]:
 def save_cursos(cursos: List[Curso]):
     save_list(CURSOS_FILE, [c.to_dict() for c in cursos])
 
+def registro_from_dict(d: Dict[str, Any]) -> Optional[Registro]:
+    tipo = d.get("tipo")
+    if tipo == "nota":
+        return RegistroNota.from_dict(d)
+    elif tipo == "asistencia":
+        return RegistroAsistencia.from_dict(d)
+    return None
+
 def load_registros() -> List[Registro]:
     raw = load_list(REGISTROS_FILE)
     registros: List[Registro] = []
     for d in raw:
-        tipo = d.get("tipo")
-        if tipo == "nota":
-            registros.append(RegistroNota.from_dict(d))
-        elif tipo == "asistencia":
-            registros.append(RegistroAsistencia.from_dict(d))
+        r = registro_from_dict(d)
+        if r is not None:
+            registros.append(r)
     return registros
+
 def save_registros(registros: List[Registro]):
     save_list(REGISTROS_FILE, [r.to_dict() for r in registros])
+
+# ---------- Paginación ----------
+# Solo los elementos de la página se convierten a modelos; el resto se queda
+# como diccionarios crudos. Las funciones load_*_pagina sirven para pedir
+# páginas sueltas, como la carga al desplazar de la interfaz: las filas
+# filtradas y ordenadas se guardan por (archivo, orden, filtro) mientras el
+# archivo no cambie, así que las páginas siguientes solo cortan la lista. El
+# filtro se compara por identidad: hay que pasar el mismo objeto en cada página.
+# Las iter_* leen el archivo una vez y entregan los modelos bloque a bloque.
+
+_MAX_INDICES_PAGINA = 16
+_filas_pagina: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+_indices_pagina: Dict[Tuple[Any, ...], Tuple[Tuple[int, int], IndicePaginas]] = {}
+
+def _indice_pagina(path: str, orden: Optional[str], descendente: bool,
+                   filtro: Optional[Callable[[Dict[str, Any]], bool]]) -> IndicePaginas:
+    """Índice de paginación del archivo, reconstruido solo cuando el archivo cambia."""
+    if _transaccion_activa is not None:
+        return IndicePaginas(load_list(path), orden, descendente, filtro)
+    recuperar_wal()
+    ruta = os.path.normpath(path)
+    actual = firma(path)
+    clave = (ruta, orden, descendente, filtro)
+    guardado = _indices_pagina.get(clave)
+    if guardado is not None and guardado[0] == actual:
+        return guardado[1]
+
+    filas_guardadas = _filas_pagina.get(ruta)
+    if filas_guardadas is None or filas_guardadas[0] != actual:
+        filas_guardadas = _filas_pagina[ruta] = (actual, _leer_archivo(path))
+    indice = IndicePaginas(filas_guardadas[1], orden, descendente, filtro)
+    _indices_pagina.pop(clave, None)
+    _indices_pagina[clave] = (actual, indice)
+    while len(_indices_pagina) > _MAX_INDICES_PAGINA:
+        del _indices_pagina[next(iter(_indices_pagina))]
+    return indice
+
+def load_pagina(path: str, limite: int, offset: int = 0, cursor: Optional[str] = None,
+                orden: Optional[str] = None, descendente: bool = False,
+                filtro: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Pagina[Dict[str, Any]]:
+    pagina = _indice_pagina(path, orden, descendente, filtro).pagina(limite, offset, cursor)
+    # Las filas guardadas son compartidas entre páginas: se entregan copias.
+    pagina.elementos = [dict(d) for d in pagina.elementos]
+    return pagina
+
+@lru_cache(maxsize=32)
+def _filtro_registros(tipo: Optional[str], curso_codigo: Optional[str],
+                      filtro: Optional[Callable[[Dict[str, Any]], bool]]) -> Callable[[Dict[str, Any]], bool]:
+    """Memorizada: con los mismos argumentos devuelve la misma función (clave de la caché de páginas)."""
+    def coincide(d: Dict[str, Any]) -> bool:
+        if d.get("tipo") not in ("nota", "asistencia"):
+            return False
+        if tipo is not None and d.get("tipo") != tipo:
+            return False
+        if curso_codigo is not None and d.get("curso_codigo") != curso_codigo:
+            return False
+        return filtro is None or filtro(d)
+    return coincide
+
+def load_estudiantes_pagina(limite: int, offset: int = 0, cursor: Optional[str] = None,
+                            orden: Optional[str] = None, descendente: bool = False,
+                            filtro: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Pagina[Estudiante]:
+    pagina = load_pagina(ESTUDIANTES_FILE, limite, offset, cursor, orden, descendente, filtro)
+    pagina.elementos = [Estudiante.from_dict(d) for d in pagina.elementos]
+    return pagina
+
+def load_cursos_pagina(limite: int, offset: int = 0, cursor: Optional[str] = None,
+                       orden: Optional[str] = None, descendente: bool = False,
+                       filtro: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Pagina[Curso]:
+    pagina = load_pagina(CURSOS_FILE, limite, offset, cursor, orden, descendente, filtro)
+    pagina.elementos = [Curso.from_dict(d) for d in pagina.elementos]
+    return pagina
+
+def load_registros_pagina(limite: int, offset: int = 0, cursor: Optional[str] = None,
+                          orden: Optional[str] = None, descendente: bool = False,
+                          tipo: Optional[str] = None, curso_codigo: Optional[str] = None,
+                          filtro: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Pagina[Registro]:
+    """Página de registros, opcionalmente restringida a un tipo ("nota"/"asistencia") y curso."""
+    coincide = _filtro_registros(tipo, curso_codigo, filtro)
+    pagina = load_pagina(REGISTROS_FILE, limite, offset, cursor, orden, descendente, coincide)
+    pagina.elementos = [registro_from_dict(d) for d in pagina.elementos]
+    return pagina
+
+def iter_estudiantes(tamano: int = 500, orden: Optional[str] = None,
+                     descendente: bool = False) -> Iterator[Estudiante]:
+    for bloque in iterar_bloques(load_list(ESTUDIANTES_FILE), tamano, orden, descendente):
+        yield from [Estudiante.from_dict(d) for d in bloque]
+
+def iter_cursos(tamano: int = 500, orden: Optional[str] = None,
+                descendente: bool = False) -> Iterator[Curso]:
+    for bloque in iterar_bloques(load_list(CURSOS_FILE), tamano, orden, descendente):
+        yield from [Curso.from_dict(d) for d in bloque]
+
+def iter_registros(tamano: int = 500, orden: Optional[str] = None, descendente: bool = False,
+                   tipo: Optional[str] = None, curso_codigo: Optional[str] = None,
+                   filtro: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Iterator[Registro]:
+    coincide = _filtro_registros(tipo, curso_codigo, filtro)
+    for bloque in iterar_bloques(load_list(REGISTROS_FILE), tamano, orden, descendente, coincide):
+        yield from [registro_from_dict(d) for d in bloque]
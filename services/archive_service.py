@@ -0,0 +1,20 @@
+from typing import List, Tuple
+from core import archive
+from core.archive import PeriodoArchivado
+from core.models import Registro
+
+def cerrar_periodo(periodo: str, hasta: str, compresion: str = "gzip") -> PeriodoArchivado:
+    """Archiva el periodo indicado; registros.json conserva solo el periodo activo."""
+    return archive.cerrar_periodo(periodo, hasta, compresion)
+
+def contar_a_archivar(hasta: str) -> Tuple[int, int]:
+    """Cantidad de notas y asistencias que se archivarían al cerrar con esa fecha."""
+    return archive.contar_a_archivar(hasta)
+
+def listar_periodos() -> List[PeriodoArchivado]:
+    """Obtiene los periodos archivados con sus resúmenes precalculados."""
+    return archive.listar_periodos()
+
+def registros_periodo(periodo: str) -> List[Registro]:
+    """Registros de un periodo archivado, leídos del archivo comprimido bajo demanda."""
+    return archive.abrir_periodo(periodo).registros()
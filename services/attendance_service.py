@@ -1,21 +1,78 @@
-from typing import List
+from typing import Iterator, List, Optional
 from core.models import RegistroAsistencia
-from core import storage
+from core.pagination import Pagina
+from core.query import Consulta
+from core.attendance_matrix import MatrizAsistencia, AlertaAsistencia
+from core import storage, integrity, snapshot
 
-from services import student_service
+# Caché de la matriz de asistencia, válida mientras registros.json no cambie.
+_matriz: Optional[MatrizAsistencia] = None
+_firma_matriz = None
 
 def registrar_asistencia(estudiante_codigo: str, curso_codigo: str, fecha: str, presente: bool):
-    if not student_service.existe_estudiante(estudiante_codigo):
-        raise ValueError(f"El estudiante con código {estudiante_codigo} no existe.")
+    integrity.validar_referencias(estudiante_codigo, curso_codigo)
 
+    firma_antes = storage.firma(storage.REGISTROS_FILE)
+    registro = RegistroAsistencia(estudiante_codigo, curso_codigo, fecha, presente)
     registros = storage.load_registros()
-    registros.append(RegistroAsistencia(estudiante_codigo, curso_codigo, fecha, presente))
+    registros.append(registro)
     storage.save_registros(registros)
+    _actualizar_matriz(registro, firma_antes)
 
 def listar_asistencia_por_curso(curso_codigo: str) -> List[RegistroAsistencia]:
-    registros = storage.load_registros()
-    return [
-        r for r in registros
-        if isinstance(r, RegistroAsistencia) and r.curso_codigo == curso_codigo
-    ]
+    snap = snapshot.snapshot_vigente()
+    if snap is not None:
+        return snap.por_curso(curso_codigo, "asistencia")
+    return Consulta().tipo("asistencia").curso(curso_codigo).ejecutar().copias()
+
+def listar_asistencia_por_estudiante(estudiante_codigo: str) -> List[RegistroAsistencia]:
+    snap = snapshot.snapshot_vigente()
+    if snap is not None:
+        return snap.por_estudiante(estudiante_codigo, "asistencia")
+    return Consulta().tipo("asistencia").estudiante(estudiante_codigo).ejecutar().copias()
+
+# ---------- Matriz de asistencia ----------
+
+def obtener_matriz() -> MatrizAsistencia:
+    """Devuelve la matriz de asistencia, reconstruyéndola si registros.json cambió."""
+    global _matriz, _firma_matriz
+    firma = storage.firma(storage.REGISTROS_FILE)
+    if _matriz is None or firma != _firma_matriz:
+        _matriz = MatrizAsistencia.desde_registros(storage.load_registros())
+        _firma_matriz = firma
+    return _matriz
+
+def _actualizar_matriz(registro: RegistroAsistencia, firma_antes):
+    """
+    Aplica un registro recién guardado sin releer el archivo, solo si la caché
+    estaba al día antes de guardar; si no, se reconstruye cuando se consulte.
+    """
+    global _firma_matriz
+    if _matriz is not None and firma_antes == _firma_matriz:
+        _matriz.registrar(registro)
+        _firma_matriz = storage.firma(storage.REGISTROS_FILE)
+
+def tasa_asistencia(estudiante_codigo: str, curso_codigo: str,
+                    desde: Optional[str] = None, hasta: Optional[str] = None) -> Optional[float]:
+    return obtener_matriz().tasa_asistencia(estudiante_codigo, curso_codigo, desde, hasta)
+
+def racha_ausencias(estudiante_codigo: str, curso_codigo: str) -> int:
+    return obtener_matriz().racha_ausencias(estudiante_codigo, curso_codigo)
+
+def alertas_asistencia(umbral: float = 0.7, curso_codigo: Optional[str] = None,
+                       desde: Optional[str] = None, hasta: Optional[str] = None) -> List[AlertaAsistencia]:
+    """Estudiantes con tasa de asistencia por debajo del umbral."""
+    return obtener_matriz().alertas(umbral, curso_codigo, desde, hasta)
+
+# ---------- Paginación ----------
+
+def listar_asistencia_por_curso_pagina(curso_codigo: str, limite: int = 50, offset: int = 0,
+                                       cursor: Optional[str] = None, orden: Optional[str] = None,
+                                       descendente: bool = False) -> Pagina[RegistroAsistencia]:
+    """Página de asistencias de un curso; sin 'orden' se usa el orden de registro."""
+    return storage.load_registros_pagina(
+        limite, offset, cursor, orden, descendente, tipo="asistencia", curso_codigo=curso_codigo
+    )
 
+def iterar_asistencia_por_curso(curso_codigo: str, tamano_pagina: int = 500) -> Iterator[RegistroAsistencia]:
+    return storage.iter_registros(tamano_pagina, tipo="asistencia", curso_codigo=curso_codigo)
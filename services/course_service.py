@@ -1,5 +1,6 @@
-from typing import List
+from typing import Iterator, List, Optional
 from core import storage
+from core.pagination import Pagina, filtro_busqueda
 from core.models import Curso
 
 def crear_curso(codigo: str, nombre: str, fecha_creacion: str) -> None:
@@ -17,3 +18,14 @@ def crear_curso(codigo: str, nombre: str, fecha_creacion: str) -> None:
 def obtener_cursos() -> List[Curso]:
     """Obtiene la lista de todos los cursos."""
     return storage.load_cursos()
+
+def obtener_cursos_pagina(limite: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                          orden: Optional[str] = None, descendente: bool = False,
+                          busqueda: str = "") -> Pagina[Curso]:
+    """Obtiene una página de cursos, filtrando por código o nombre."""
+    filtro = filtro_busqueda(busqueda, ("codigo", "nombre"))
+    return storage.load_cursos_pagina(limite, offset, cursor, orden, descendente, filtro)
+
+def iterar_cursos(tamano_pagina: int = 500, orden: Optional[str] = None) -> Iterator[Curso]:
+    """Recorre los cursos página a página (el archivo se lee una sola vez)."""
+    return storage.iter_cursos(tamano_pagina, orden)
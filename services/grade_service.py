@@ -1,21 +1,77 @@
-from typing import List
+from typing import Iterator, List, Optional
 from core.models import RegistroNota
-from core import storage
+from core import storage, integrity, snapshot
+from core.pagination import Pagina
+from core.query import Consulta
+from core.ranking import RankingCursos, PosicionRanking
 
-from services import student_service
+# Caché del ranking por curso, válida mientras registros.json no cambie.
+_ranking: Optional[RankingCursos] = None
+_firma_ranking = None
 
 def agregar_nota(estudiante_codigo: str, curso_codigo: str, nota: float):
-    if not student_service.existe_estudiante(estudiante_codigo):
-        raise ValueError(f"El estudiante con código {estudiante_codigo} no existe.")
+    integrity.validar_referencias(estudiante_codigo, curso_codigo)
 
+    firma_antes = storage.firma(storage.REGISTROS_FILE)
+    registro = RegistroNota(estudiante_codigo, curso_codigo, nota)
     registros = storage.load_registros()
-    registros.append(RegistroNota(estudiante_codigo, curso_codigo, nota))
+    registros.append(registro)
     storage.save_registros(registros)
+    _actualizar_ranking(registro, firma_antes)
 
 def listar_notas_por_curso(curso_codigo: str) -> List[RegistroNota]:
-    registros = storage.load_registros()
-    return [
-        r for r in registros
-        if isinstance(r, RegistroNota) and r.curso_codigo == curso_codigo
-    ]
+    snap = snapshot.snapshot_vigente()
+    if snap is not None:
+        return snap.por_curso(curso_codigo, "nota")
+    return Consulta().tipo("nota").curso(curso_codigo).ejecutar().copias()
+
+def listar_notas_por_estudiante(estudiante_codigo: str) -> List[RegistroNota]:
+    snap = snapshot.snapshot_vigente()
+    if snap is not None:
+        return snap.por_estudiante(estudiante_codigo, "nota")
+    return Consulta().tipo("nota").estudiante(estudiante_codigo).ejecutar().copias()
+
+def listar_notas_por_curso_pagina(curso_codigo: str, limite: int = 50, offset: int = 0,
+                                  cursor: Optional[str] = None, orden: Optional[str] = None,
+                                  descendente: bool = False) -> Pagina[RegistroNota]:
+    """Página de notas de un curso; sin 'orden' se usa el orden de registro."""
+    return storage.load_registros_pagina(
+        limite, offset, cursor, orden, descendente, tipo="nota", curso_codigo=curso_codigo
+    )
+
+def iterar_notas_por_curso(curso_codigo: str, tamano_pagina: int = 500) -> Iterator[RegistroNota]:
+    return storage.iter_registros(tamano_pagina, tipo="nota", curso_codigo=curso_codigo)
+
+# ---------- Ranking ----------
+
+def obtener_ranking() -> RankingCursos:
+    """Devuelve el ranking por curso, reconstruyéndolo si registros.json cambió."""
+    global _ranking, _firma_ranking
+    firma = storage.firma(storage.REGISTROS_FILE)
+    if _ranking is None or firma != _firma_ranking:
+        _ranking = RankingCursos.desde_registros(storage.load_registros())
+        _firma_ranking = firma
+    return _ranking
+
+def _actualizar_ranking(registro: RegistroNota, firma_antes):
+    """
+    Aplica una nota recién guardada sin releer el archivo, solo si la caché
+    estaba al día antes de guardar; si no, se reconstruye cuando se consulte.
+    """
+    global _firma_ranking
+    if _ranking is not None and firma_antes == _firma_ranking:
+        _ranking.agregar(registro)
+        _firma_ranking = storage.firma(storage.REGISTROS_FILE)
+
+def ranking_curso(curso_codigo: str) -> List[PosicionRanking]:
+    """Ranking completo del curso por promedio de notas."""
+    return obtener_ranking().top(curso_codigo)
+
+def top_estudiantes(curso_codigo: str, k: int = 10) -> List[PosicionRanking]:
+    return obtener_ranking().top(curso_codigo, k)
+
+def posicion_estudiante(estudiante_codigo: str, curso_codigo: str) -> Optional[int]:
+    return obtener_ranking().posicion(estudiante_codigo, curso_codigo)
 
+def percentil_estudiante(estudiante_codigo: str, curso_codigo: str) -> Optional[float]:
+    return obtener_ranking().percentil(estudiante_codigo, curso_codigo)
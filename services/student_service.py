@@ -1,5 +1,6 @@
-from typing import List
-from core import storage
+from typing import Iterator, List, Optional
+from core import storage, integrity
+from core.pagination import Pagina, filtro_busqueda
 from core.models import Estudiante
 
 def crear_estudiante(codigo: str, nombre: str, email: str) -> None:
@@ -27,5 +28,15 @@ def obtener_estudiantes() -> List[Estudiante]:
 
 def existe_estudiante(codigo: str) -> bool:
     """Verifica si un estudiante existe por su código."""
-    estudiantes = storage.load_estudiantes()
-    return any(e.codigo == codigo for e in estudiantes)
+    return codigo in integrity.codigos_estudiantes()
+
+def obtener_estudiantes_pagina(limite: int = 50, offset: int = 0, cursor: Optional[str] = None,
+                               orden: Optional[str] = None, descendente: bool = False,
+                               busqueda: str = "") -> Pagina[Estudiante]:
+    """Obtiene una página de estudiantes, filtrando por código, nombre o email."""
+    filtro = filtro_busqueda(busqueda, ("codigo", "nombre", "email"))
+    return storage.load_estudiantes_pagina(limite, offset, cursor, orden, descendente, filtro)
+
+def iterar_estudiantes(tamano_pagina: int = 500, orden: Optional[str] = None) -> Iterator[Estudiante]:
+    """Recorre los estudiantes página a página (el archivo se lee una sola vez)."""
+    return storage.iter_estudiantes(tamano_pagina, orden)
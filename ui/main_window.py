@@ -11,10 +11,13 @@ from PyQt6.QtGui import QRegularExpressionValidator
 # Módulos de lógica de negocio y persistencia
 # Se asume que estos archivos y clases existen en la estructura del proyecto
 from utils import validators
-from services import grade_service, attendance_service, course_service, student_service
-from core import storage
-from core.models import RegistroNota, RegistroAsistencia, Estudiante, Curso
-from core.reports import ReporteNotas, ReporteAsistencias 
+from services import grade_service, attendance_service, course_service, student_service, archive_service
+from core import storage, integrity, snapshot
+from core.models import Estudiante, Curso
+from core.reports import ReporteNotas, ReporteAsistencias, ReporteRanking
+
+# Cantidad de filas que se cargan en cada tabla por página (carga al desplazar)
+TAMANO_PAGINA = 50
 
 class VentanaPrincipal(QMainWindow):
     """
@@ -33,6 +36,7 @@ class VentanaPrincipal(QMainWindow):
         self._configurar_fechas()
         self._configurar_menu() 
         self._conectar_signals() # Conexión de botones y eventos de búsqueda
+        self._configurar_paginacion()
         self._cargar_datos_iniciales()
     
     # ----------------------------------------------------------------------
@@ -134,6 +138,35 @@ class VentanaPrincipal(QMainWindow):
             self.exportar_reporte_asistencia_por_estudiante
         )
 
+        self.actReporteRanking = menu_reportes.addAction(
+            "Exportar ranking por curso"
+        )
+        self.actReporteRanking.triggered.connect(self.exportar_reporte_ranking)
+
+        self.actReporteHistorico = menu_reportes.addAction(
+            "Exportar reporte histórico de un periodo"
+        )
+        self.actReporteHistorico.triggered.connect(self.exportar_reporte_historico)
+
+        self.actAlertasAsistencia = menu_reportes.addAction(
+            "Alertas de asistencia baja"
+        )
+        self.actAlertasAsistencia.triggered.connect(self.mostrar_alertas_asistencia)
+
+        menu_herramientas = barra.addMenu("Herramientas")
+        self.actVerificarIntegridad = menu_herramientas.addAction(
+            "Verificar integridad de datos"
+        )
+        self.actVerificarIntegridad.triggered.connect(self.verificar_integridad)
+
+        self.actGenerarSnapshot = menu_herramientas.addAction(
+            "Generar snapshot de registros para reportes"
+        )
+        self.actGenerarSnapshot.triggered.connect(self.generar_snapshot)
+
+        self.actCerrarPeriodo = menu_herramientas.addAction("Cerrar periodo académico")
+        self.actCerrarPeriodo.triggered.connect(self.cerrar_periodo)
+
     def _conectar_signals(self):
         """
         Define las conexiones entre las acciones del usuario (clicks, texto cambiado)
@@ -159,6 +192,57 @@ class VentanaPrincipal(QMainWindow):
         self.txtBuscarAsistencias.textChanged.connect(self.buscar_asistencias)
 
 
+    def _configurar_paginacion(self):
+        """
+        Prepara la carga por páginas de las tablas: cuando el usuario llega al final
+        de la barra de desplazamiento se pide la siguiente página al servicio.
+        """
+        self._paginacion = {}
+        for tabla in (self.tblEstudiantes, self.tblCursos, self.tblNotas, self.tblAsistencias):
+            tabla.verticalScrollBar().valueChanged.connect(
+                lambda valor, t=tabla: self._al_desplazar_tabla(t, valor)
+            )
+
+    def _al_desplazar_tabla(self, tabla, valor: int):
+        """Carga la siguiente página cuando la barra de desplazamiento llega al final."""
+        if valor >= tabla.verticalScrollBar().maximum():
+            self._cargar_siguiente_pagina(tabla)
+
+    def _iniciar_tabla_paginada(self, tabla, encabezados, cargar_pagina, a_columnas):
+        """
+        Reinicia una tabla y carga su primera página.
+        - cargar_pagina(cursor) devuelve una Pagina del servicio correspondiente.
+        - a_columnas(elemento) devuelve los textos de cada columna.
+        """
+        tabla.setRowCount(0)
+        tabla.setColumnCount(len(encabezados))
+        tabla.setHorizontalHeaderLabels(encabezados)
+        self._paginacion[tabla] = {
+            "cargar": cargar_pagina,
+            "columnas": a_columnas,
+            "cursor": None,
+            "agotada": False,
+        }
+        self._cargar_siguiente_pagina(tabla)
+        tabla.resizeColumnsToContents()
+
+    def _cargar_siguiente_pagina(self, tabla):
+        """Agrega al final de la tabla las filas de la siguiente página, si queda alguna."""
+        estado = self._paginacion.get(tabla)
+        if not estado or estado["agotada"]:
+            return
+
+        pagina = estado["cargar"](estado["cursor"])
+        fila = tabla.rowCount()
+        tabla.setRowCount(fila + len(pagina.elementos))
+        for elemento in pagina.elementos:
+            for col, texto in enumerate(estado["columnas"](elemento)):
+                tabla.setItem(fila, col, QTableWidgetItem(texto))
+            fila += 1
+
+        estado["cursor"] = pagina.siguiente_cursor
+        estado["agotada"] = pagina.siguiente_cursor is None
+
     def _cargar_datos_iniciales(self):
         """
         Método llamado al inicio para popular todas las tablas y Combobox con 
@@ -182,24 +266,14 @@ class VentanaPrincipal(QMainWindow):
 
     def _cargar_tabla_estudiantes(self, filtro: str = ""):
         """Filtra y actualiza la tabla de estudiantes, buscando coincidencias en Código, Nombre o Email."""
-        estudiantes = student_service.obtener_estudiantes()
-        
-        if filtro:
-            estudiantes = [
-                e for e in estudiantes 
-                if filtro in e.codigo.upper() or filtro in e.nombre.upper() or filtro in e.email.upper()
-            ]
-
-        self.tblEstudiantes.setRowCount(len(estudiantes))
-        self.tblEstudiantes.setColumnCount(3)
-        self.tblEstudiantes.setHorizontalHeaderLabels(["Código", "Nombre", "Email"])
-
-        for i, est in enumerate(estudiantes):
-            self.tblEstudiantes.setItem(i, 0, QTableWidgetItem(est.codigo))
-            self.tblEstudiantes.setItem(i, 1, QTableWidgetItem(est.nombre))
-            self.tblEstudiantes.setItem(i, 2, QTableWidgetItem(est.email))
-
-        self.tblEstudiantes.resizeColumnsToContents()
+        self._iniciar_tabla_paginada(
+            self.tblEstudiantes,
+            ["Código", "Nombre", "Email"],
+            lambda cursor: student_service.obtener_estudiantes_pagina(
+                TAMANO_PAGINA, cursor=cursor, busqueda=filtro
+            ),
+            lambda est: [est.codigo, est.nombre, est.email],
+        )
 
     def buscar_cursos(self):
         """Obtiene el texto de búsqueda del curso y dispara la actualización de la tabla."""
@@ -208,24 +282,14 @@ class VentanaPrincipal(QMainWindow):
 
     def _cargar_tabla_cursos(self, filtro: str = ""):
         """Filtra y actualiza la tabla de cursos, buscando coincidencias en Código o Nombre."""
-        cursos = course_service.obtener_cursos()
-        
-        if filtro:
-            cursos = [
-                c for c in cursos 
-                if filtro in c.codigo.upper() or filtro in c.nombre.upper()
-            ]
-
-        self.tblCursos.setRowCount(len(cursos))
-        self.tblCursos.setColumnCount(3)
-        self.tblCursos.setHorizontalHeaderLabels(["Código", "Nombre", "Fecha Creación"])
-
-        for row, c in enumerate(cursos):
-            self.tblCursos.setItem(row, 0, QTableWidgetItem(c.codigo))
-            self.tblCursos.setItem(row, 1, QTableWidgetItem(c.nombre))
-            self.tblCursos.setItem(row, 2, QTableWidgetItem(c.fecha_creacion))
-        
-        self.tblCursos.resizeColumnsToContents()
+        self._iniciar_tabla_paginada(
+            self.tblCursos,
+            ["Código", "Nombre", "Fecha Creación"],
+            lambda cursor: course_service.obtener_cursos_pagina(
+                TAMANO_PAGINA, cursor=cursor, busqueda=filtro
+            ),
+            lambda c: [c.codigo, c.nombre, c.fecha_creacion],
+        )
 
     def buscar_notas(self):
         """Obtiene el código de estudiante para buscar y filtrar la tabla de notas."""
@@ -234,25 +298,18 @@ class VentanaPrincipal(QMainWindow):
 
     def _cargar_tabla_notas(self, filtro_estudiante: str = ""):
         """Filtra y actualiza la tabla de notas por código de estudiante."""
-        registros = storage.load_registros()
-        notas = [r for r in registros if isinstance(r, RegistroNota)]
-        
+        filtro = None
         if filtro_estudiante:
-            notas = [
-                n for n in notas 
-                if filtro_estudiante in n.estudiante_codigo.upper()
-            ]
-            
-        self.tblNotas.setRowCount(len(notas))
-        self.tblNotas.setColumnCount(3)
-        self.tblNotas.setHorizontalHeaderLabels(["Estudiante", "Curso", "Nota"])
-
-        for row, r in enumerate(notas):
-            self.tblNotas.setItem(row, 0, QTableWidgetItem(r.estudiante_codigo))
-            self.tblNotas.setItem(row, 1, QTableWidgetItem(r.curso_codigo))
-            self.tblNotas.setItem(row, 2, QTableWidgetItem(str(r.nota)))
-
-        self.tblNotas.resizeColumnsToContents()
+            filtro = lambda d: filtro_estudiante in d.get("estudiante_codigo", "").upper()
+
+        self._iniciar_tabla_paginada(
+            self.tblNotas,
+            ["Estudiante", "Curso", "Nota"],
+            lambda cursor: storage.load_registros_pagina(
+                TAMANO_PAGINA, cursor=cursor, tipo="nota", filtro=filtro
+            ),
+            lambda r: [r.estudiante_codigo, r.curso_codigo, str(r.nota)],
+        )
 
     def buscar_asistencias(self):
         """Obtiene el texto de búsqueda para filtrar la tabla de asistencias por estudiante o curso."""
@@ -261,30 +318,25 @@ class VentanaPrincipal(QMainWindow):
 
     def _cargar_tabla_asistencias(self, filtro: str = ""):
         """Filtra y actualiza la tabla de asistencias por código de estudiante o código de curso."""
-        registros = storage.load_registros()
-        asistencias = [r for r in registros if isinstance(r, RegistroAsistencia)]
-        
+        filtro_dict = None
         if filtro:
-            asistencias = [
-                a for a in asistencias 
-                if filtro in a.estudiante_codigo.upper() or filtro in a.curso_codigo.upper()
-            ]
-
-        self.tblAsistencias.setRowCount(len(asistencias))
-        self.tblAsistencias.setColumnCount(4)
-        self.tblAsistencias.setHorizontalHeaderLabels(
-            ["Fecha", "Estudiante", "Curso", "Estado"]
+            filtro_dict = lambda d: (
+                filtro in d.get("estudiante_codigo", "").upper()
+                or filtro in d.get("curso_codigo", "").upper()
+            )
+
+        self._iniciar_tabla_paginada(
+            self.tblAsistencias,
+            ["Fecha", "Estudiante", "Curso", "Estado"],
+            lambda cursor: storage.load_registros_pagina(
+                TAMANO_PAGINA, cursor=cursor, tipo="asistencia", filtro=filtro_dict
+            ),
+            lambda r: [
+                r.fecha, r.estudiante_codigo, r.curso_codigo,
+                "Presente" if r.presente else "Ausente"
+            ],
         )
 
-        for row, r in enumerate(asistencias):
-            estado = "Presente" if r.presente else "Ausente"
-            self.tblAsistencias.setItem(row, 0, QTableWidgetItem(r.fecha))
-            self.tblAsistencias.setItem(row, 1, QTableWidgetItem(r.estudiante_codigo))
-            self.tblAsistencias.setItem(row, 2, QTableWidgetItem(r.curso_codigo))
-            self.tblAsistencias.setItem(row, 3, QTableWidgetItem(estado))
-
-        self.tblAsistencias.resizeColumnsToContents()
-
     # ----------------------------------------------------------------------
     # 💾 Lógica de Registro (CRUD - Creación)
     # ----------------------------------------------------------------------
@@ -406,11 +458,7 @@ class VentanaPrincipal(QMainWindow):
             return
 
         codigo = codigo.strip().upper()
-        registros = storage.load_registros()
-        registros_est = [
-            r for r in registros
-            if isinstance(r, RegistroNota) and r.estudiante_codigo.upper() == codigo
-        ]
+        registros_est = grade_service.listar_notas_por_estudiante(codigo)
 
         if not registros_est:
             self._mensaje("Sin datos", f"No hay notas registradas para el estudiante {codigo}.")
@@ -446,11 +494,7 @@ class VentanaPrincipal(QMainWindow):
             return
 
         codigo = codigo.strip().upper()
-        registros = storage.load_registros()
-        registros_est = [
-            r for r in registros
-            if isinstance(r, RegistroAsistencia) and r.estudiante_codigo.upper() == codigo
-        ]
+        registros_est = attendance_service.listar_asistencia_por_estudiante(codigo)
 
         if not registros_est:
             self._mensaje("Sin datos", f"No hay asistencias registradas para el estudiante {codigo}.")
@@ -473,4 +517,165 @@ class VentanaPrincipal(QMainWindow):
                 f.write(texto)
             self._mensaje("Éxito", f"Reporte de asistencia guardado en:\n{ruta}")
         except Exception as e:
-            self._mensaje("Error", f"No se pudo guardar el reporte:\n{e}")
\ No newline at end of file
+            self._mensaje("Error", f"No se pudo guardar el reporte:\n{e}")
+
+    def exportar_reporte_ranking(self):
+        """Genera un reporte .txt con el ranking de estudiantes de un curso."""
+        codigo, ok = QInputDialog.getText(
+            self,
+            "Reporte de ranking",
+            "Ingrese el Código de curso:"
+        )
+        if not ok or not codigo.strip():
+            return
+
+        codigo = codigo.strip().upper()
+        registros_curso = grade_service.listar_notas_por_curso(codigo)
+
+        if not registros_curso:
+            self._mensaje("Sin datos", f"No hay notas registradas para el curso {codigo}.")
+            return
+
+        reporte = ReporteRanking() # Uso de patrón Polimorfismo
+        texto = reporte.generar(registros_curso)
+
+        ruta, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar reporte de ranking",
+            f"reporte_ranking_{codigo}.txt",
+            "Archivos de texto (*.txt)"
+        )
+        if not ruta:
+            return
+
+        try:
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(texto)
+            self._mensaje("Éxito", f"Reporte de ranking guardado en:\n{ruta}")
+        except Exception as e:
+            self._mensaje("Error", f"No se pudo guardar el reporte:\n{e}")
+
+    def exportar_reporte_historico(self):
+        """Genera un reporte de notas y asistencias de un periodo archivado."""
+        periodos = [p.periodo for p in archive_service.listar_periodos()]
+        if not periodos:
+            self._mensaje("Sin datos", "No hay periodos archivados.")
+            return
+
+        periodo, ok = QInputDialog.getItem(
+            self,
+            "Reporte histórico",
+            "Seleccione el periodo:",
+            periodos, len(periodos) - 1, False
+        )
+        if not ok:
+            return
+
+        try:
+            registros = archive_service.registros_periodo(periodo)
+        except Exception as e:
+            self._mensaje("Error", f"No se pudo leer el archivo del periodo {periodo}:\n{e}")
+            return
+
+        texto = "\n\n".join(
+            reporte.generar(registros) # Uso de patrón Polimorfismo
+            for reporte in (ReporteNotas(), ReporteAsistencias())
+        )
+
+        ruta, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar reporte histórico",
+            f"reporte_historico_{periodo}.txt",
+            "Archivos de texto (*.txt)"
+        )
+        if not ruta:
+            return
+
+        try:
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(texto)
+            self._mensaje("Éxito", f"Reporte histórico guardado en:\n{ruta}")
+        except Exception as e:
+            self._mensaje("Error", f"No se pudo guardar el reporte:\n{e}")
+
+    def mostrar_alertas_asistencia(self):
+        """Lista los estudiantes cuya tasa de asistencia por curso está bajo un umbral."""
+        umbral, ok = QInputDialog.getDouble(
+            self,
+            "Alertas de asistencia",
+            "Umbral mínimo de asistencia (%):",
+            70.0, 0.0, 100.0, 1
+        )
+        if not ok:
+            return
+
+        alertas = attendance_service.alertas_asistencia(umbral / 100)
+        if not alertas:
+            self._mensaje("Sin alertas", "Todos los estudiantes superan el umbral indicado.")
+            return
+
+        lineas = [
+            f"{a.estudiante_codigo} - {a.curso_codigo}: {a.tasa:.0%} "
+            f"({a.registrados} clases, racha de ausencias: "
+            f"{attendance_service.racha_ausencias(a.estudiante_codigo, a.curso_codigo)})"
+            for a in alertas
+        ]
+        self._mensaje("Alertas de asistencia", "\n".join(lineas))
+
+    def verificar_integridad(self):
+        """Escanea los registros buscando huérfanos, duplicados y malformados."""
+        informe = integrity.escanear()
+        titulo = "Integridad correcta" if informe.correcto else "Problemas de integridad"
+        self._mensaje(titulo, informe.resumen())
+
+    def generar_snapshot(self):
+        """Regenera el snapshot de solo lectura que usan los reportes y listados."""
+        try:
+            n = snapshot.escribir_snapshot()
+            self._mensaje("Éxito", f"Snapshot generado con {n} registros.")
+        except (OSError, KeyError, ValueError) as e:
+            self._mensaje("Error", f"No se pudo generar el snapshot:\n{e}")
+
+    def cerrar_periodo(self):
+        """
+        Archiva las notas registradas y las asistencias hasta la fecha indicada.
+        Las tablas se recargan porque registros.json queda solo con el periodo activo.
+        """
+        periodo, ok = QInputDialog.getText(
+            self,
+            "Cerrar periodo",
+            "Nombre del periodo (ej: 2025-I):"
+        )
+        if not ok or not periodo.strip():
+            return
+
+        hasta, ok = QInputDialog.getText(
+            self,
+            "Cerrar periodo",
+            "Archivar asistencias hasta la fecha (YYYY-MM-DD).\n"
+            "Todas las notas registradas se archivan con el periodo:",
+            text=QDate.currentDate().toString("yyyy-MM-dd")
+        )
+        if not ok or not QDate.fromString(hasta.strip(), "yyyy-MM-dd").isValid():
+            self._mensaje("Error", "Ingrese una fecha válida con formato YYYY-MM-DD.")
+            return
+
+        notas, asistencias = archive_service.contar_a_archivar(hasta.strip())
+        respuesta = QMessageBox.question(
+            self,
+            "Cerrar periodo",
+            f"Se moverán al archivo del periodo {periodo.strip()}:\n"
+            f"- {notas} notas (todas las registradas, sin importar la fecha)\n"
+            f"- {asistencias} asistencias hasta el {hasta.strip()}\n\n"
+            "Dejarán de aparecer en las tablas y en el ranking. ¿Continuar?"
+        )
+        if respuesta != QMessageBox.StandardButton.Yes:
+            return
+
+        try:
+            archivado = archive_service.cerrar_periodo(periodo.strip(), hasta.strip())
+            self._mensaje("Éxito", f"Periodo {archivado.periodo} archivado ({archivado.total} registros).")
+            self._cargar_tabla_notas()
+            self._cargar_tabla_asistencias()
+        except ValueError as e:
+            self._mensaje("Error", str(e))